@@ -0,0 +1,183 @@
+"""
+asyncio interface
+
+Every AsyncConnection owns one worker thread that makes all the blocking
+ODBC calls for that connection and its cursors, so a slow SQLExecute or
+SQLFetch only waits in its own thread and the event loop keeps running.
+Calls on one connection run one at a time, in the order they were made.
+
+    conn = await ohdbc.aio.connect(connstr)
+    cur = await conn.cursor()
+    await cur.execute('SELECT ...')
+    async for batch in cur.fetch_batches():
+        ...
+    await conn.close()
+"""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+
+from ohdbc.connection import Connection
+
+_DONE = object()
+
+
+async def connect(connstr, **kwargs):
+    """Create a connection to an ODBC data source in a new worker thread"""
+    executor = ThreadPoolExecutor(max_workers=1,
+                                  thread_name_prefix='ohdbc-aio')
+    try:
+        conn = await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(Connection, connstr, **kwargs))
+    except BaseException:
+        executor.shutdown(wait=False)
+        raise
+    return AsyncConnection(conn, executor)
+
+
+class AsyncConnection:
+    def __init__(self, conn, executor):
+        """Wrap a Connection whose calls all run in executor"""
+        self.conn = conn
+        self._executor = executor
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        await self.close()
+
+    @property
+    def closed(self):
+        return self.conn.closed
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args))
+
+    async def cursor(self):
+        """Get a cursor for this connection"""
+        return AsyncCursor(self, await self._run(self.conn.cursor))
+
+    async def commit(self):
+        await self._run(self.conn.commit)
+
+    async def rollback(self):
+        await self._run(self.conn.rollback)
+
+    async def close(self):
+        """Close the connection and stop its worker thread"""
+        try:
+            await self._run(self.conn.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+class AsyncCursor:
+    __slots__ = ('connection', 'cursor')
+
+    def __init__(self, connection, cursor):
+        """Wrap a Cursor, other attributes (arraysize, prefetch, ...) are
+        read from and set on the wrapped cursor. Its methods can only be
+        called through the async versions, in the worker thread."""
+        object.__setattr__(self, 'connection', connection)
+        object.__setattr__(self, 'cursor', cursor)
+
+    def __getattr__(self, name):
+        value = getattr(self.cursor, name)
+        if inspect.ismethod(value):
+            raise AttributeError(
+                "Cursor.{} has no async version".format(name))
+        return value
+
+    def __setattr__(self, name, value):
+        setattr(self.cursor, name, value)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        await self.close()
+
+    async def execute(self, stmt=None, params=None):
+        await self.connection._run(self.cursor.execute, stmt, params)
+        return self
+
+    async def prepare(self, stmt):
+        await self.connection._run(self.cursor.prepare, stmt)
+
+    async def executemany(self, stmt, seq_of_params):
+        await self.connection._run(self.cursor.executemany, stmt,
+                                   seq_of_params)
+        return self
+
+    async def load_columns(self, stmt, columns):
+        await self.connection._run(self.cursor.load_columns, stmt, columns)
+        return self
+
+    async def execute_batch(self, statements):
+        await self.connection._run(self.cursor.execute_batch, statements)
+        return self
+
+    async def nextset(self):
+        return await self.connection._run(self.cursor.nextset)
+
+    async def fetchmany(self, n=None):
+        """Fetch the next n rows (by default a block) as a list, None when
+        exhausted"""
+        return await self.connection._run(self._fetch_list, n)
+
+    def _fetch_list(self, n):
+        rows = self.cursor.fetchmany(n)
+        return None if rows is None else list(rows)
+
+    async def fetchall(self, columns=False):
+        return await self.connection._run(self.cursor.fetchall, columns)
+
+    async def fetchnumpy(self):
+        return await self.connection._run(self.cursor.fetchnumpy)
+
+    async def fetchbatch(self):
+        """Fetch the next block as a lazy Batch, None when exhausted"""
+        return await self.connection._run(self.cursor.fetchbatch)
+
+    async def fetch_batches(self):
+        """Iterate over all remaining blocks of rows, as lists of tuples"""
+        while True:
+            rows = await self.fetchmany()
+            if rows is None:
+                return
+            yield rows
+
+    async def fetch_batches_numpy(self):
+        """Iterate over all remaining blocks, as returned by fetchnumpy"""
+        async for batch in self._iterate(self.cursor.fetch_batches_numpy()):
+            yield batch
+
+    async def fetch_arrow_batches(self):
+        """Iterate over all remaining blocks as Arrow RecordBatches"""
+        async for batch in self._iterate(self.cursor.fetch_arrow_batches()):
+            yield batch
+
+    async def fetch_arrow_table(self):
+        return await self.connection._run(self.cursor.fetch_arrow_table)
+
+    async def export(self, path, format='csv', compression=None):
+        return await self.connection._run(self.cursor.export, path, format,
+                                          compression)
+
+    async def _iterate(self, batches):
+        """Run a generator of the cursor in the worker thread"""
+        try:
+            while True:
+                batch = await self.connection._run(next, batches, _DONE)
+                if batch is _DONE:
+                    return
+                yield batch
+        finally:
+            await self.connection._run(batches.close)
+
+    async def close(self):
+        await self.connection._run(self.cursor.close)
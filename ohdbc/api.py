@@ -0,0 +1,87 @@
+"""
+ODBC API table
+
+The driver manager is loaded once per process and every function ohdbc
+calls gets its exact prototype, so ctypes doesn't have to guess how to
+convert arguments and return values on every call.
+"""
+
+import ctypes
+import sys
+import threading
+
+SQLRETURN = ctypes.c_short
+SQLSMALLINT = ctypes.c_short
+SQLUSMALLINT = ctypes.c_ushort
+SQLINTEGER = ctypes.c_int
+SQLLEN = ctypes.c_ssize_t
+SQLULEN = ctypes.c_size_t
+SQLPOINTER = ctypes.c_void_p
+SQLHANDLE = ctypes.c_void_p
+SQLHWND = ctypes.c_void_p
+
+# name: argtypes, all functions return SQLRETURN
+PROTOTYPES = {
+    'SQLAllocHandle': (SQLSMALLINT, SQLHANDLE, SQLPOINTER),
+    'SQLFreeHandle': (SQLSMALLINT, SQLHANDLE),
+    'SQLSetEnvAttr': (SQLHANDLE, SQLINTEGER, SQLPOINTER, SQLINTEGER),
+    'SQLDriverConnectW': (SQLHANDLE, SQLHWND, SQLPOINTER, SQLSMALLINT,
+                          SQLPOINTER, SQLSMALLINT, SQLPOINTER, SQLUSMALLINT),
+    'SQLDisconnect': (SQLHANDLE,),
+    'SQLSetConnectAttr': (SQLHANDLE, SQLINTEGER, SQLPOINTER, SQLINTEGER),
+    'SQLGetConnectAttr': (SQLHANDLE, SQLINTEGER, SQLPOINTER, SQLINTEGER,
+                          SQLPOINTER),
+    'SQLEndTran': (SQLSMALLINT, SQLHANDLE, SQLSMALLINT),
+    'SQLGetDiagRecW': (SQLSMALLINT, SQLHANDLE, SQLSMALLINT, SQLPOINTER,
+                       SQLPOINTER, SQLPOINTER, SQLSMALLINT, SQLPOINTER),
+    'SQLSetStmtAttr': (SQLHANDLE, SQLINTEGER, SQLPOINTER, SQLINTEGER),
+    'SQLFreeStmt': (SQLHANDLE, SQLUSMALLINT),
+    'SQLPrepare': (SQLHANDLE, ctypes.c_char_p, SQLINTEGER),
+    'SQLExecute': (SQLHANDLE,),
+    'SQLExecDirectW': (SQLHANDLE, SQLPOINTER, SQLINTEGER),
+    'SQLMoreResults': (SQLHANDLE,),
+    'SQLNumResultCols': (SQLHANDLE, SQLPOINTER),
+    'SQLRowCount': (SQLHANDLE, SQLPOINTER),
+    'SQLDescribeColW': (SQLHANDLE, SQLUSMALLINT, SQLPOINTER, SQLSMALLINT,
+                        SQLPOINTER, SQLPOINTER, SQLPOINTER, SQLPOINTER,
+                        SQLPOINTER),
+    'SQLColAttributeW': (SQLHANDLE, SQLUSMALLINT, SQLUSMALLINT, SQLPOINTER,
+                         SQLSMALLINT, SQLPOINTER, SQLPOINTER),
+    'SQLBindCol': (SQLHANDLE, SQLUSMALLINT, SQLSMALLINT, SQLPOINTER, SQLLEN,
+                   SQLPOINTER),
+    'SQLBindParameter': (SQLHANDLE, SQLUSMALLINT, SQLSMALLINT, SQLSMALLINT,
+                         SQLSMALLINT, SQLULEN, SQLSMALLINT, SQLPOINTER,
+                         SQLLEN, SQLPOINTER),
+    'SQLFetch': (SQLHANDLE,),
+    'SQLGetData': (SQLHANDLE, SQLUSMALLINT, SQLSMALLINT, SQLPOINTER, SQLLEN,
+                   SQLPOINTER),
+    'SQLSetPos': (SQLHANDLE, SQLULEN, SQLUSMALLINT, SQLUSMALLINT),
+    'SQLGetInfoW': (SQLHANDLE, SQLUSMALLINT, SQLPOINTER, SQLSMALLINT,
+                    SQLPOINTER),
+}
+
+_api = None
+_api_lock = threading.Lock()
+
+
+def library_name():
+    if sys.platform == 'darwin':
+        return 'libodbc.2.dylib'
+    return 'libodbc.so'
+
+
+def load():
+    """Load the driver manager and declare the prototypes, once.
+    The library is loaded on first use, not at import, so ohdbc can be
+    imported on machines without an ODBC driver manager."""
+    global _api
+    with _api_lock:
+        if _api is None:
+            api = ctypes.cdll.LoadLibrary(library_name())
+            for name, argtypes in PROTOTYPES.items():
+                # CDLL caches the function pointer as an attribute
+                func = getattr(api, name)
+                func.argtypes = argtypes
+                func.restype = SQLRETURN
+            _api = api
+        return _api
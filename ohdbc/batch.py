@@ -0,0 +1,163 @@
+"""
+Lazy batches
+
+A Batch wraps one fetched block of column-wise bound buffers and decodes a
+value only when it is accessed, so rows that are filtered out on one or two
+columns never convert the others. The cursor detaches the batch (copies
+its buffers) before the next fetch overwrites them, so a batch stays valid
+for as long as it is referenced.
+"""
+
+import ctypes
+from decimal import Decimal
+
+from ohdbc.sql import *
+from ohdbc.sqltypes import *
+from ohdbc.utils import char_codec, convert_column, decode_column, \
+    temporal_value
+
+
+def cell_reader(col):
+    """Function row number -> value of a bound column"""
+    if col.unbound:
+        return col.buff.__getitem__
+    buff = col.buff
+    indicator = col.indicator
+    if col.sql_type in TEMPORAL_SQL_TYPES:
+        return lambda i: (None if indicator[i] == SQL_NULL_DATA
+                          else temporal_value(col, buff[i]))
+    if col.target_type == SQL_C_BINARY:
+        address = ctypes.addressof(buff)
+        width = col.charsize
+        return lambda i: (None if indicator[i] < 0 else ctypes.string_at(
+            address + i * width, indicator[i]))
+    if not col.is_char_array:
+        return lambda i: (None if indicator[i] == SQL_NULL_DATA
+                          else buff[i])
+    codec, unit, errors = char_codec(col)
+    address = ctypes.addressof(buff)
+    width = col.charsize
+    limit = width - unit
+    string_at = ctypes.string_at
+    if col.sql_type in DECIMAL_SQL_TYPES:
+        def read(i):
+            length = indicator[i]
+            if length < 0:
+                return None
+            return Decimal(string_at(address + i * width,
+                                     min(length, limit)).decode(codec))
+        return read
+
+    def read(i):
+        length = indicator[i]
+        if length < 0:
+            return None
+        value = string_at(address + i * width,
+                          min(length, limit)).decode(codec, errors)
+        return value.rstrip(' ') if col.is_fixed_width else value
+    return read
+
+
+def _copy_column(col, nrows):
+    """Copy the first nrows of the buffers of a bound column"""
+    if col.unbound:
+        return col
+    buff = (col.buff._type_ * nrows)()
+    ctypes.memmove(buff, col.buff, ctypes.sizeof(buff))
+    indicator = (ctypes.c_ssize_t * nrows)()
+    ctypes.memmove(indicator, col.indicator, ctypes.sizeof(indicator))
+    return col._replace(buff=buff, indicator=indicator)
+
+
+class Row:
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index):
+        """A row of a Batch, values by position, column name or attribute"""
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key):
+        batch = self._batch
+        if isinstance(key, str):
+            key = batch.positions[key]
+        return batch._readers[key](self._index)
+
+    def __getattr__(self, name):
+        try:
+            position = self._batch.positions[name]
+        except KeyError:
+            raise AttributeError(name)
+        return self._batch._readers[position](self._index)
+
+    def __len__(self):
+        return len(self._batch.columns)
+
+    def __iter__(self):
+        index = self._index
+        return (read(index) for read in self._batch._readers)
+
+    def __eq__(self, other):
+        if isinstance(other, (Row, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return 'Row({})'.format(', '.join(
+            '{}={!r}'.format(name, value)
+            for name, value in zip(self._batch.names, self)))
+
+    def as_dict(self):
+        return dict(zip(self._batch.names, self))
+
+
+class Batch:
+    def __init__(self, columns, nrows, decode=decode_column):
+        """Rows of a fetched block, decoded on access. Text columns
+        converted as a whole are decoded with decode(col, nrows)."""
+        self.columns = columns
+        self.nrows = nrows
+        self.names = [col.name for col in columns]
+        self.positions = {name: j for j, name in enumerate(self.names)}
+        self._decode = decode
+        self._converted = {}
+        self._readers = [cell_reader(col) for col in columns]
+
+    def __len__(self):
+        return self.nrows
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.nrows
+        if not 0 <= index < self.nrows:
+            raise IndexError('batch index out of range')
+        return Row(self, index)
+
+    def __iter__(self):
+        return (Row(self, i) for i in range(self.nrows))
+
+    def value(self, index, key):
+        """Value of column key (position or name) of a row"""
+        return self[index][key]
+
+    def column(self, key):
+        """All values of column key (position or name) as a list,
+        converted in one pass"""
+        if isinstance(key, str):
+            key = self.positions[key]
+        values = self._converted.get(key)
+        if values is None:
+            values = self._converted[key] = convert_column(
+                self.columns[key], self.nrows, self._decode)
+        return values
+
+    def tuples(self):
+        """All rows as tuples"""
+        return list(zip(*[self.column(j)
+                          for j in range(len(self.columns))]))
+
+    def detach(self):
+        """Copy the buffers, so the batch no longer depends on the ones the
+        cursor fetches into"""
+        self.columns = [_copy_column(col, self.nrows) for col in self.columns]
+        self._readers = [cell_reader(col) for col in self.columns]
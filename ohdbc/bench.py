@@ -0,0 +1,241 @@
+"""
+Fetch benchmark
+
+Sweeps arraysize, column types, row counts, fetch methods and column- or
+row-wise binding and reports rows/s, MB/s of bound buffer and peak Python
+memory for each case.
+
+By default the data is generated in a local SQLite database with the
+sqlite3 module and read back through the SQLite ODBC driver, so no
+network or database server is needed:
+
+    python -m ohdbc.bench --rows 10000 100000 --arraysize 1 100 1000
+
+Use --connstr and --query to run the fetch methods against any other
+data source instead.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ohdbc
+from ohdbc import columnar
+
+COLUMN_TYPES = {
+    'int': ('INTEGER', lambda i: i),
+    'bigint': ('BIGINT', lambda i: i * 1000003),
+    'double': ('DOUBLE', lambda i: i / 7),
+    'varchar': ('VARCHAR(16)', lambda i: 'value {}'.format(i)),
+    'varchar_long': ('VARCHAR(1000)',
+                     lambda i: 'long value {} '.format(i) * 8),
+    # reported as SQL_WVARCHAR by the SQLite driver, fetched as UTF-16
+    'nvarchar': ('NVARCHAR(16)', lambda i: 'wert \u00e4 {}'.format(i)),
+    'char': ('CHAR(10)', lambda i: 'c{}'.format(i % 1000)),
+}
+
+
+def _fetchmany(cur):
+    rows = 0
+    while True:
+        batch = cur.fetchmany()
+        if batch is None:
+            return rows
+        rows += len(list(batch))
+
+
+def _fetchall(cur):
+    return len(cur.fetchall())
+
+
+def _numpy(cur):
+    return sum(len(batch[0]) for batch in cur.fetch_batches_numpy())
+
+
+def _arrow(cur):
+    return sum(batch.num_rows for batch in cur.fetch_arrow_batches())
+
+
+METHODS = {
+    'fetchmany': _fetchmany,
+    'fetchall': _fetchall,
+    'numpy': _numpy,
+    'arrow': _arrow,
+}
+
+# methods that read the column buffers directly
+COLUMNAR_METHODS = ('numpy', 'arrow')
+
+
+def available_methods():
+    """Fetch methods whose optional dependencies are installed"""
+    methods = ['fetchmany', 'fetchall']
+    if columnar.numpy is not None:
+        methods.append('numpy')
+        if columnar.pyarrow is not None:
+            methods.append('arrow')
+    return methods
+
+
+def create_sqlite_tables(path, column_types, row_counts, ncols):
+    """Create one table per column type and row count, return their names"""
+    db = sqlite3.connect(path)
+    tables = {}
+    for type_name, rows in itertools.product(column_types, row_counts):
+        sql_type, make_value = COLUMN_TYPES[type_name]
+        table = 'bench_{}_{}'.format(type_name, rows)
+        cols = ', '.join('c{} {}'.format(j, sql_type) for j in range(ncols))
+        db.execute('DROP TABLE IF EXISTS {}'.format(table))
+        db.execute('CREATE TABLE {} ({})'.format(table, cols))
+        placeholders = ', '.join('?' * ncols)
+        db.executemany(
+            'INSERT INTO {} VALUES ({})'.format(table, placeholders),
+            ((make_value(i),) * ncols for i in range(rows)))
+        tables[type_name, rows] = table
+    db.commit()
+    db.close()
+    return tables
+
+
+def run_case(conn, query, method, arraysize, prefetch=False,
+             bind_type='column', measure_memory=False):
+    """Execute query and fetch it with method, return a result dict"""
+    cur = conn.cursor()
+    cur.arraysize = arraysize
+    cur.prefetch = prefetch
+    cur.bind_type = bind_type
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    cur.execute(query)
+    rows = METHODS[method](cur)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    bound_bytes = rows * cur.row_width
+    cur.close()
+    return {
+        'method': method,
+        'arraysize': arraysize,
+        'rowset_size': cur.rowset_size,
+        'prefetch': prefetch,
+        'bind_type': bind_type,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else None,
+        'mb_per_sec': bound_bytes / elapsed / 1e6 if elapsed else None,
+        'peak_bytes': peak,
+    }
+
+
+def run(conn, queries, methods, arraysizes, prefetch=(False,), repeat=1,
+        measure_memory=True, bind_types=('column',)):
+    """Run every combination of query, method, arraysize, prefetch and
+    bind type, keep the fastest of repeat runs and yield the results"""
+    for (label, query), method, arraysize, pf, bind_type in \
+            itertools.product(queries, methods, arraysizes, prefetch,
+                              bind_types):
+        if bind_type == 'row' and (pf or method in COLUMNAR_METHODS):
+            continue  # only column-wise binding supports these
+        best = min((run_case(conn, query, method, arraysize, pf, bind_type)
+                    for _ in range(repeat)), key=lambda r: r['seconds'])
+        if measure_memory:
+            best['peak_bytes'] = run_case(
+                conn, query, method, arraysize, pf, bind_type,
+                measure_memory=True)['peak_bytes']
+        best['case'] = label
+        yield best
+
+
+def format_result(result):
+    peak = result['peak_bytes']
+    return ('{case:<24} {method:<10} {arraysize:>6} {prefetch!s:<5} '
+            '{bind_type:<6} {rows:>9} {rows_per_sec:>12.0f} '
+            '{mb_per_sec:>9.1f} {peak}'.format(
+                peak='-' if peak is None else '{:.1f}'.format(peak / 1e6),
+                **result))
+
+
+HEADER = ('{:<24} {:<10} {:>6} {:<5} {:<6} {:>9} {:>12} {:>9} {}'.format(
+    'case', 'method', 'array', 'pref', 'bind', 'rows', 'rows/s', 'MB/s',
+    'peak MB'))
+
+
+def _arraysize(value):
+    return value if value == 'auto' else int(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ohdbc.bench',
+                                     description=__doc__.split('\n\n')[1])
+    parser.add_argument('--connstr', help='benchmark this data source '
+                        'instead of a generated SQLite database')
+    parser.add_argument('--query', action='append', default=[],
+                        help='query to run with --connstr (repeatable)')
+    parser.add_argument('--driver', default='SQLite3',
+                        help='ODBC driver name for the SQLite database')
+    parser.add_argument('--types', nargs='+', default=sorted(COLUMN_TYPES),
+                        choices=sorted(COLUMN_TYPES))
+    parser.add_argument('--rows', nargs='+', type=int, default=[100000])
+    parser.add_argument('--columns', type=int, default=4,
+                        help='number of columns per generated table')
+    parser.add_argument('--arraysize', nargs='+', type=_arraysize,
+                        default=[1, 10, 100, 1000, 'auto'])
+    parser.add_argument('--methods', nargs='+', choices=sorted(METHODS),
+                        default=available_methods())
+    parser.add_argument('--prefetch', action='store_true',
+                        help='also run every case with prefetch enabled')
+    parser.add_argument('--bind-type', nargs='+', default=['column'],
+                        choices=['column', 'row'],
+                        help='column- and/or row-wise binding')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the extra run that measures peak memory')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    if args.connstr:
+        connstr = args.connstr
+        queries = [(query, query) for query in args.query]
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, 'bench.sqlite')
+        tables = create_sqlite_tables(path, args.types, args.rows,
+                                      args.columns)
+        # NoWCHAR=0: the driver reports NVARCHAR columns as wide text
+        connstr = 'Driver={};Database={};NoWCHAR=0'.format(args.driver,
+                                                          path)
+        queries = [('{} x{}'.format(*key), 'SELECT * FROM {}'.format(table))
+                   for key, table in sorted(tables.items())]
+
+    prefetch = (False, True) if args.prefetch else (False,)
+    conn = ohdbc.connect(connstr)
+    results = []
+    print(HEADER)
+    try:
+        for result in run(conn, queries, args.methods, args.arraysize,
+                          prefetch, args.repeat, not args.no_memory,
+                          args.bind_type):
+            print(format_result(result))
+            sys.stdout.flush()
+            results.append(result)
+    finally:
+        conn.close()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
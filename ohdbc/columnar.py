@@ -0,0 +1,581 @@
+"""
+Columnar conversion of the bound column buffers.
+
+Instead of converting every value to a Python object, each column buffer
+is converted to an array in one go. NumPy and pyarrow are optional
+dependencies.
+"""
+
+import codecs
+import functools
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+from ohdbc.sql import *
+from ohdbc.sqltypes import *
+from ohdbc.utils import binary_column, char_codec, decode_column, \
+    to_decimals
+
+# decimals of up to this precision are converted to scaled int64 arrays
+MAX_SCALED_PRECISION = 18
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("NumPy is required for columnar fetching")
+
+
+def _require_pyarrow():
+    _require_numpy()
+    if pyarrow is None:
+        raise ImportError("pyarrow is required for Arrow fetching")
+
+
+def null_mask(col, nrows):
+    """Boolean array, True where the value in a column is NULL"""
+    indicator = numpy.frombuffer(col.indicator, dtype=numpy.intp,
+                                 count=nrows)
+    return indicator == SQL_NULL_DATA
+
+
+def column_to_numpy(col, nrows, decode=decode_column):
+    """Convert a bound column to a NumPy masked array.
+    The values are copied, so the result stays valid after the next fetch.
+    Text is decoded with decode(col, nrows).
+    """
+    _require_numpy()
+    if col.unbound:
+        return _unbound_to_numpy(col)
+    mask = null_mask(col, nrows) if col.nullable else numpy.ma.nomask
+    if col.sql_type in DECIMAL_SQL_TYPES:
+        values = _decimal_to_numpy(col, nrows)
+    elif col.is_char_array:
+        values = numpy.empty(nrows, dtype=object)
+        values[:] = decode(col, nrows)
+    elif col.sql_type in TEMPORAL_SQL_TYPES:
+        values = temporal_to_numpy(col, nrows)
+    elif col.target_type == SQL_C_BINARY:
+        values = numpy.empty(nrows, dtype=object)
+        values[:] = binary_column(col, nrows)
+    else:
+        values = numpy.frombuffer(col.buff, dtype=col.ctype,
+                                  count=nrows).copy()
+    return numpy.ma.MaskedArray(values, mask=mask)
+
+
+def _unbound_to_numpy(col):
+    """Masked array of the values read for an unbound column"""
+    mask = numpy.array([value is None for value in col.buff], dtype=bool)
+    if col.is_char_array or col.target_type == SQL_C_BINARY or \
+            col.sql_type in TEMPORAL_SQL_TYPES:
+        values = numpy.empty(len(col.buff), dtype=object)
+        values[:] = col.buff
+    else:
+        values = numpy.array([0 if value is None else value
+                              for value in col.buff], dtype=col.ctype)
+    return numpy.ma.MaskedArray(values, mask=mask)
+
+
+def temporal_to_numpy(col, nrows):
+    """Convert a bound date, time or timestamp struct column to
+    datetime64[D], timedelta64[s] or datetime64[us] in one pass"""
+    fields = numpy.frombuffer(col.buff, dtype=numpy.dtype(col.ctype),
+                              count=nrows)
+    if col.sql_type == SQL_TYPE_TIME:
+        return (fields['hour'].astype('m8[h]') +
+                fields['minute'].astype('m8[m]') +
+                fields['second'].astype('m8[s]'))
+    months = ((fields['year'].astype(numpy.int64) - 1970) * 12 +
+              fields['month'].astype(numpy.int64) - 1).astype('M8[M]')
+    dates = months.astype('M8[D]') + \
+        (fields['day'].astype(numpy.int64) - 1).astype('m8[D]')
+    if col.sql_type == SQL_TYPE_DATE:
+        return dates
+    return (dates.astype('M8[us]') +
+            fields['hour'].astype('m8[h]') +
+            fields['minute'].astype('m8[m]') +
+            fields['second'].astype('m8[s]') +
+            (fields['fraction'] // 1000).astype('m8[us]'))
+
+
+def scaled_integers(col, nrows):
+    """Parse the decimal strings of a bound DECIMAL/NUMERIC column into
+    int64 values scaled by 10 ** scale, all rows at once. Digits beyond
+    the scale are dropped, so precision must not exceed 18."""
+    width = col.charsize
+    raw = numpy.frombuffer(col.buff, dtype=numpy.uint8,
+                           count=nrows * width).reshape(nrows, width)
+    indicator = numpy.frombuffer(col.indicator, dtype=numpy.intp,
+                                 count=nrows)
+    lengths = numpy.clip(indicator, 0, width - 1)[:, None]
+    pos = numpy.arange(width)
+    valid = pos < lengths
+    is_point = valid & (raw == ord('.'))
+    point = numpy.where(is_point.any(axis=1), is_point.argmax(axis=1),
+                        lengths[:, 0])[:, None]
+    # power of ten of every digit relative to the decimal point, scaled
+    exponent = numpy.where(pos < point, point - pos - 1, point - pos)
+    exponent += col.scale
+    digits = valid & (raw >= ord('0')) & (raw <= ord('9')) & (exponent >= 0)
+    weights = numpy.power(10, numpy.clip(exponent, 0, MAX_SCALED_PRECISION),
+                          dtype=numpy.int64)
+    values = ((raw.astype(numpy.int64) - ord('0')) * weights *
+              digits).sum(axis=1)
+    return numpy.where(raw[:, 0] == ord('-'), -values, values)
+
+
+def _decimal_to_numpy(col, nrows):
+    if col.precision <= MAX_SCALED_PRECISION:
+        return scaled_integers(col, nrows)
+    values = numpy.empty(nrows, dtype=object)
+    values[:] = to_decimals(decode_column(col, nrows))
+    return values
+
+
+def to_numpy(columns, nrows, decode=decode_column):
+    """Convert all bound columns to a list of NumPy masked arrays"""
+    return [column_to_numpy(col, nrows, decode) for col in columns]
+
+
+def arrow_type(col):
+    """Arrow data type for a bound column"""
+    _require_pyarrow()
+    if col.sql_type in DECIMAL_SQL_TYPES and col.precision <= 38:
+        return pyarrow.decimal128(col.precision, col.scale)
+    if col.is_char_array:
+        return pyarrow.string()
+    if col.sql_type == SQL_TYPE_DATE:
+        return pyarrow.date32()
+    if col.sql_type == SQL_TYPE_TIME:
+        return pyarrow.time32('s')
+    if col.sql_type == SQL_TYPE_TIMESTAMP:
+        return pyarrow.timestamp('us')
+    if col.target_type == SQL_C_BINARY:
+        return pyarrow.binary()
+    return pyarrow.from_numpy_dtype(numpy.dtype(col.ctype))
+
+
+def arrow_schema(columns, dictionaries=None):
+    """Arrow schema for a list of bound columns, columns in dictionaries
+    are dictionary encoded"""
+    dictionaries = dictionaries or {}
+    fields = []
+    for col in columns:
+        type_ = arrow_type(col)
+        if col.col_num in dictionaries:
+            type_ = pyarrow.dictionary(pyarrow.int32(), type_)
+        fields.append(pyarrow.field(col.name, type_, nullable=col.nullable))
+    return pyarrow.schema(fields)
+
+
+def _validity(col, nrows):
+    """Arrow validity bitmap and null count from the indicator array"""
+    if not col.nullable:
+        return None, 0
+    mask = null_mask(col, nrows)
+    null_count = int(mask.sum())
+    if not null_count:
+        return None, 0
+    bitmap = numpy.packbits(~mask, bitorder='little')
+    return pyarrow.py_buffer(bitmap), null_count
+
+
+def _char_lengths(col, nrows):
+    """Byte length of every value in a character column, 0 for NULL"""
+    indicator = numpy.frombuffer(col.indicator, dtype=numpy.intp,
+                                 count=nrows)
+    # values longer than the buffer are truncated by the driver
+    unit = 2 if col.target_type == SQL_WCHAR else 1
+    return numpy.clip(indicator, 0, col.charsize - unit)
+
+
+def _trim_padding(col, nrows, lengths):
+    """Shorten the lengths of fixed width values to drop trailing spaces"""
+    unit = 2 if col.target_type == SQL_WCHAR else 1
+    width = col.charsize // unit
+    units = numpy.frombuffer(col.buff, dtype='<u{}'.format(unit),
+                             count=nrows * width).reshape(nrows, width)
+    used = numpy.arange(width) < (lengths // unit)[:, None]
+    keep = used & (units != 0x20)
+    last = width - numpy.argmax(keep[:, ::-1], axis=1)
+    return numpy.where(keep.any(axis=1), last, 0) * unit
+
+
+def _gather_chars(col, nrows, lengths):
+    """Pack the values of a fixed stride char buffer into one data array"""
+    raw = numpy.frombuffer(col.buff, dtype=numpy.uint8,
+                           count=nrows * col.charsize)
+    raw = raw.reshape(nrows, col.charsize)
+    return raw[numpy.arange(col.charsize) < lengths[:, None]]
+
+
+def _offsets(lengths):
+    offsets = numpy.zeros(len(lengths) + 1, dtype=numpy.int32)
+    numpy.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+@functools.lru_cache()
+def _ascii_compatible(codec):
+    ascii = bytes(range(128))
+    try:
+        return ascii.decode(codec) == ascii.decode('ascii')
+    except UnicodeDecodeError:
+        return False
+
+
+def _utf8_compatible(col, data):
+    """Whether the narrow text of a column can be used as UTF-8 as is"""
+    codec = codecs.lookup(char_codec(col)[0]).name
+    if codec == 'utf-8':
+        return True
+    return _ascii_compatible(codec) and not (data.size and data.max() >= 0x80)
+
+
+def _string_to_arrow(col, nrows, validity, null_count):
+    lengths = _char_lengths(col, nrows)
+    if col.is_fixed_width:
+        lengths = _trim_padding(col, nrows, lengths)
+    data = _gather_chars(col, nrows, lengths)
+    if col.target_type != SQL_WCHAR and not _utf8_compatible(col, data):
+        return pyarrow.array(decode_column(col, nrows),
+                             type=pyarrow.string())
+    if col.target_type == SQL_WCHAR:
+        units = data.view('<u2')
+        if units.size and units.max() >= 0x80:
+            # not ASCII: transcode UTF-16 to UTF-8 the slow way
+            return pyarrow.array(decode_column(col, nrows),
+                                 type=pyarrow.string())
+        # ASCII only: UTF-8 is the low byte of every UTF-16 code unit
+        data = units.astype(numpy.uint8)
+        lengths = lengths // 2
+    return pyarrow.Array.from_buffers(
+        pyarrow.string(), nrows,
+        [validity, pyarrow.py_buffer(_offsets(lengths)),
+         pyarrow.py_buffer(data)],
+        null_count)
+
+
+def _binary_to_arrow(col, nrows, validity, null_count):
+    indicator = numpy.frombuffer(col.indicator, dtype=numpy.intp,
+                                 count=nrows)
+    lengths = numpy.clip(indicator, 0, col.charsize)
+    return pyarrow.Array.from_buffers(
+        pyarrow.binary(), nrows,
+        [validity, pyarrow.py_buffer(_offsets(lengths)),
+         pyarrow.py_buffer(_gather_chars(col, nrows, lengths))],
+        null_count)
+
+
+def _temporal_to_arrow(col, nrows, validity, null_count):
+    values = temporal_to_numpy(col, nrows)
+    if col.sql_type == SQL_TYPE_DATE:
+        data = values.view(numpy.int64).astype(numpy.int32)
+    elif col.sql_type == SQL_TYPE_TIME:
+        data = values.astype('m8[s]').view(numpy.int64).astype(numpy.int32)
+    else:
+        data = values.view(numpy.int64)
+    return pyarrow.Array.from_buffers(
+        arrow_type(col), nrows, [validity, pyarrow.py_buffer(data)],
+        null_count)
+
+
+def _decimal_to_arrow(col, nrows, validity, null_count):
+    if col.precision > MAX_SCALED_PRECISION:
+        values = decode_column(col, nrows)
+        if col.precision <= 38:
+            values = to_decimals(values)
+        return pyarrow.array(values, type=arrow_type(col))
+    values = scaled_integers(col, nrows)
+    # decimal128 is a little endian 128 bit two's complement integer
+    data = numpy.empty((nrows, 2), dtype='<i8')
+    data[:, 0] = values
+    data[:, 1] = values >> 63
+    return pyarrow.Array.from_buffers(
+        arrow_type(col), nrows, [validity, pyarrow.py_buffer(data)],
+        null_count)
+
+
+class ArrowValues:
+    def __init__(self):
+        """The values of a StringDictionary as an Arrow string array,
+        grown in place. New values are written past the end of the buffers
+        earlier arrays see, so every batch only encodes its new values."""
+        self.count = 0
+        self.offsets = numpy.zeros(1024, dtype=numpy.int32)
+        self.data = numpy.empty(64 * 1024, dtype=numpy.uint8)
+
+    @staticmethod
+    def _grow(buff, size):
+        if size <= len(buff):
+            return buff
+        grown = numpy.empty(max(size, 2 * len(buff)), dtype=buff.dtype)
+        grown[:len(buff)] = buff
+        return grown
+
+    def array(self, values):
+        """Arrow array of values, of which the first count were added
+        before"""
+        new = [value.encode('utf_8') for value in values[self.count:]]
+        if new:
+            start = self.offsets[self.count]
+            ends = start + numpy.cumsum([len(value) for value in new])
+            self.offsets = self._grow(self.offsets,
+                                      self.count + len(new) + 1)
+            self.data = self._grow(self.data, int(ends[-1]))
+            self.data[start:ends[-1]] = numpy.frombuffer(b''.join(new),
+                                                         dtype=numpy.uint8)
+            self.offsets[self.count + 1:self.count + len(new) + 1] = ends
+            self.count += len(new)
+        size = self.offsets[self.count]
+        return pyarrow.Array.from_buffers(
+            pyarrow.string(), self.count,
+            [None, pyarrow.py_buffer(self.offsets[:self.count + 1]),
+             pyarrow.py_buffer(self.data[:size])])
+
+
+def _dictionary_to_arrow(col, nrows, validity, null_count, dictionary):
+    """Dictionary encode a bound text column, finding the distinct values
+    of the block with numpy.unique. The schema is fixed, so a column with
+    more than max_size distinct values raises ValueError."""
+    lengths = _char_lengths(col, nrows)
+    width = col.charsize
+    raw = numpy.frombuffer(col.buff, dtype=numpy.uint8,
+                           count=nrows * width).reshape(nrows, width)
+    # bytes past the end of a value are left over from earlier fetches
+    keys = numpy.where(numpy.arange(width) < lengths[:, None], raw, 0)
+    keys = numpy.ascontiguousarray(keys).view('V{}'.format(width)).ravel()
+    uniques, first, inverse = numpy.unique(keys, return_index=True,
+                                           return_inverse=True)
+    codes = numpy.array([dictionary.code(col, raw[i, :lengths[i]].tobytes())
+                         for i in first], dtype=numpy.int32)
+    if len(dictionary.values) > dictionary.max_size:
+        raise ValueError(
+            "Column {} has more than {} distinct values, too many to "
+            "dictionary encode".format(col.name, dictionary.max_size))
+    indices = pyarrow.Array.from_buffers(
+        pyarrow.int32(), nrows,
+        [validity, pyarrow.py_buffer(codes[inverse.ravel()])], null_count)
+    if dictionary.arrow is None:
+        dictionary.arrow = ArrowValues()
+    return pyarrow.DictionaryArray.from_arrays(
+        indices, dictionary.arrow.array(dictionary.values))
+
+
+def column_to_arrow(col, nrows, dictionary=None):
+    """Convert a bound column to an Arrow array.
+    Text columns with a StringDictionary become dictionary arrays.
+    Fixed width columns wrap the bound buffer without copying, so the
+    buffer must not be bound to the statement any more.
+    """
+    _require_pyarrow()
+    if col.unbound:
+        return pyarrow.array(col.buff, type=arrow_type(col))
+    validity, null_count = _validity(col, nrows)
+    if col.sql_type in DECIMAL_SQL_TYPES:
+        return _decimal_to_arrow(col, nrows, validity, null_count)
+    if dictionary is not None:
+        return _dictionary_to_arrow(col, nrows, validity, null_count,
+                                    dictionary)
+    if col.is_char_array:
+        return _string_to_arrow(col, nrows, validity, null_count)
+    if col.sql_type in TEMPORAL_SQL_TYPES:
+        return _temporal_to_arrow(col, nrows, validity, null_count)
+    if col.target_type == SQL_C_BINARY:
+        return _binary_to_arrow(col, nrows, validity, null_count)
+    return pyarrow.Array.from_buffers(
+        arrow_type(col), nrows, [validity, pyarrow.py_buffer(col.buff)],
+        null_count)
+
+
+def to_arrow(columns, nrows, schema=None, dictionaries=None):
+    """Convert all bound columns to an Arrow RecordBatch"""
+    dictionaries = dictionaries or {}
+    if schema is None:
+        schema = arrow_schema(columns, dictionaries)
+    arrays = [column_to_arrow(col, nrows, dictionaries.get(col.col_num))
+              for col in columns]
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export(blocks, schema, path, format='csv', compression=None,
+           dictionaries=None):
+    """Write (columns, nrows) blocks to a CSV or Parquet file, each block
+    as soon as it is converted, so the buffers can be reused for the next
+    one. Returns the number of rows written."""
+    _require_pyarrow()
+    if format == 'parquet':
+        import pyarrow.parquet
+        options = {} if compression is None else {'compression': compression}
+        sink = None
+        writer = pyarrow.parquet.ParquetWriter(path, schema, **options)
+    elif format == 'csv':
+        import pyarrow.csv
+        sink = pyarrow.OSFile(path, 'wb')
+        if compression is not None:
+            sink = pyarrow.CompressedOutputStream(sink, compression)
+        writer = pyarrow.csv.CSVWriter(sink, schema)
+    else:
+        raise ValueError("Unknown export format: {}".format(format))
+    rows = 0
+    try:
+        for columns, nrows in blocks:
+            writer.write_batch(to_arrow(columns, nrows, schema,
+                                        dictionaries))
+            rows += nrows
+    finally:
+        writer.close()
+        if sink is not None:
+            sink.close()
+    return rows
+
+
+# NumPy dtype -> (C type, SQL type, column size) for parameters that are
+# bound straight from the array memory
+NUMPY_PARAM_TYPES = {
+    'b1': (SQL_C_BIT, SQL_BIT, 1),
+    'i1': (SQL_C_STINYINT, SQL_TINYINT, 3),
+    'i2': (SQL_C_SSHORT, SQL_SMALLINT, 5),
+    'i4': (SQL_C_SLONG, SQL_INTEGER, 10),
+    'i8': (SQL_C_SBIGINT, SQL_BIGINT, 19),
+    'u1': (SQL_C_UTINYINT, SQL_SMALLINT, 3),
+    'u2': (SQL_C_USHORT, SQL_INTEGER, 5),
+    'u4': (SQL_C_ULONG, SQL_BIGINT, 10),
+    'u8': (SQL_C_UBIGINT, SQL_BIGINT, 20),
+    'f4': (SQL_C_FLOAT, SQL_REAL, 7),
+    'f8': (SQL_C_DOUBLE, SQL_DOUBLE, 15),
+}
+
+
+def param_arrays(columns):
+    """List of (values, mask) arrays from a mapping of name to NumPy
+    (masked) array or from an Arrow table, in column order"""
+    _require_numpy()
+    if hasattr(columns, 'column_names'):  # Arrow table
+        return [_arrow_param_array(columns.column(name).combine_chunks())
+                for name in columns.column_names]
+    arrays = []
+    for values in columns.values():
+        mask = None
+        if isinstance(values, numpy.ma.MaskedArray):
+            mask = numpy.ma.getmaskarray(values)
+            values = values.data
+        arrays.append((numpy.asarray(values), mask))
+    return arrays
+
+
+def _arrow_param_array(array):
+    mask = None
+    if array.null_count:
+        mask = array.is_null().to_numpy(zero_copy_only=False)
+        if pyarrow.types.is_string(array.type):
+            array = array.fill_null('')
+        elif not pyarrow.types.is_null(array.type):
+            array = array.fill_null(0)
+    values = array.to_numpy(zero_copy_only=False)
+    if values.dtype == object and pyarrow.types.is_string(array.type):
+        values = values.astype(str)
+    return values, mask
+
+
+def _utf16_units(values):
+    """Fixed stride UTF-16 code units of a NumPy unicode array, in one pass
+    when every character is in the Basic Multilingual Plane"""
+    width = max(values.dtype.itemsize // 4, 1)
+    points = numpy.ascontiguousarray(values).view(numpy.uint32)
+    points = points.reshape(len(values), -1)
+    if points.size and points.max() > 0xFFFF:
+        return None
+    # one extra unit for the null terminator
+    units = numpy.zeros((len(values), width + 1), dtype='<u2')
+    units[:, :points.shape[1]] = points
+    return units
+
+
+# fractional second digits of the datetime64 units finer than a second
+DATETIME64_DIGITS = {'ms': 3, 'us': 6, 'ns': 9, 'ps': 9, 'fs': 9, 'as': 9}
+
+
+def _temporal_param(values):
+    """Date or timestamp struct array of a datetime64 array (without NaT),
+    filled in one pass from its fields, the inverse of temporal_to_numpy.
+    Returns (c_type, sql_type, column_size, decimal_digits, data)."""
+    unit = numpy.datetime_data(values.dtype)[0]
+    years = values.astype('M8[Y]')
+    months = values.astype('M8[M]')
+    days = values.astype('M8[D]')
+    if unit in ('Y', 'M', 'W', 'D'):
+        c_type, sql_type, column_size, digits = \
+            SQL_C_TYPE_DATE, SQL_TYPE_DATE, 10, 0
+        data = numpy.zeros(len(values), dtype=numpy.dtype(SQL_DATE_STRUCT))
+    else:
+        digits = DATETIME64_DIGITS.get(unit, 0)
+        c_type, sql_type = SQL_C_TYPE_TIMESTAMP, SQL_TYPE_TIMESTAMP
+        column_size = 20 + digits if digits else 19
+        data = numpy.zeros(len(values),
+                           dtype=numpy.dtype(SQL_TIMESTAMP_STRUCT))
+        nanoseconds = (values - days).astype('m8[ns]').astype(numpy.int64)
+        seconds, data['fraction'] = numpy.divmod(nanoseconds, 10 ** 9)
+        data['hour'] = seconds // 3600
+        data['minute'] = seconds // 60 % 60
+        data['second'] = seconds % 60
+    data['year'] = years.astype(numpy.int64) + 1970
+    data['month'] = (months - years).astype(numpy.int64) + 1
+    data['day'] = (days - months).astype(numpy.int64) + 1
+    return c_type, sql_type, column_size, digits, data
+
+
+def numpy_param(values, mask=None):
+    """Parameter array for a NumPy array: returns (c_type, sql_type,
+    column_size, decimal_digits, data, stride, indicator), or None if the
+    array has to be bound as Python values"""
+    if values.ndim != 1:
+        raise ValueError("Parameter arrays must be one dimensional")
+    decimal_digits = 0
+    key = '{}{}'.format(values.dtype.kind, values.dtype.itemsize)
+    if values.dtype.kind == 'M':
+        nat = numpy.isnat(values)
+        if nat.any():
+            mask = nat if mask is None else mask | nat
+            values = numpy.where(nat, numpy.zeros_like(values), values)
+        c_type, sql_type, column_size, decimal_digits, data = \
+            _temporal_param(values)
+        stride = data.dtype.itemsize
+        lengths = numpy.zeros(len(data), dtype=numpy.intp)
+    elif key in NUMPY_PARAM_TYPES:
+        c_type, sql_type, column_size = NUMPY_PARAM_TYPES[key]
+        data = numpy.ascontiguousarray(values,
+                                       dtype=values.dtype.newbyteorder('='))
+        stride = data.dtype.itemsize
+        lengths = numpy.zeros(len(data), dtype=numpy.intp)
+    elif values.dtype.kind == 'S':
+        c_type, sql_type = SQL_C_CHAR, SQL_VARCHAR
+        data = numpy.ascontiguousarray(values)
+        stride = data.dtype.itemsize
+        lengths = numpy.char.str_len(data).astype(numpy.intp)
+        column_size = max(stride, 1)
+    elif values.dtype.kind == 'U':
+        data = _utf16_units(values)
+        if data is None:
+            return None
+        c_type, sql_type = SQL_C_WCHAR, SQL_WVARCHAR
+        stride = data.shape[1] * 2
+        lengths = numpy.char.str_len(values).astype(numpy.intp) * 2
+        column_size = max(data.shape[1] - 1, 1)
+    else:
+        return None
+    if mask is None:
+        indicator = lengths
+    else:
+        indicator = numpy.where(mask, SQL_NULL_DATA, lengths)
+        indicator = indicator.astype(numpy.intp)
+    return (c_type, sql_type, column_size, decimal_digits, data, stride,
+            indicator)
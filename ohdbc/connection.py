@@ -1,22 +1,33 @@
 import ctypes
-import sys
+import threading
 import time
 
+import ohdbc.api
 import ohdbc.utils as utils
 from ohdbc.cursor import Cursor
+from ohdbc.instrument import emit, perf_counter
 from ohdbc.sql import *
 from ohdbc.sqltypes import *
+from ohdbc.statement import StatementCache
 from ohdbc.utils import check_error
 
 
-def _init_env():
+_shared_env = None
+_shared_env_lock = threading.Lock()
+
+
+def _init_env(pooling=False):
     """Initialize ODBC env handle
-    Maybe add some more settings here, connection pooling etc.
+    With pooling the driver manager keeps its own pool of connections
+    for this environment (SQL_ATTR_CONNECTION_POOLING). The attribute is
+    process-wide, so it also applies to every environment allocated later.
     """
-    if sys.platform == 'darwin':
-        api = ctypes.cdll.LoadLibrary('libodbc.2.dylib')
-    else:
-        api = ctypes.cdll.LoadLibrary('libodbc.so')
+    api = ohdbc.api.load()
+    if pooling:
+        # process level attribute, must be set before allocating the env
+        rc = api.SQLSetEnvAttr(None, SQL_ATTR_CONNECTION_POOLING,
+                               SQL_CP_ONE_PER_HENV, 0)
+        check_error(None, rc, 'enable connection pooling')
     env_h = ctypes.c_void_p()
     rc = api.SQLAllocHandle(SQL_HANDLE_ENV, SQL_NULL_HANDLE,
                             ctypes.byref(env_h))
@@ -28,11 +39,39 @@ def _init_env():
     return env_h, api
 
 
+def shared_env():
+    """The env handle and API shared by all connections, created once"""
+    global _shared_env
+    with _shared_env_lock:
+        if _shared_env is None:
+            _shared_env = _init_env()
+        return _shared_env
+
+
 class Connection:
-    def __init__(self, connstr, autocommit=False, **kwargs):
-        """Create a connection to an ODBC data source"""
-        self.env_h, self.api = _init_env()
+    def __init__(self, connstr, autocommit=False, statement_cache_size=32,
+                 env=None, encoding='utf_8', max_char_bytes=None,
+                 instrument=False, **kwargs):
+        """Create a connection to an ODBC data source
+        Up to statement_cache_size prepared statements that are not in use
+        by a cursor are kept for reuse, keyed by their SQL text.
+        env is an (env handle, api) tuple, by default the shared one.
+        Narrow text columns (CHAR, VARCHAR) are fetched in the client
+        encoding, the codec the driver manager delivers them in, with
+        max_char_bytes bytes of buffer per character, by default the octet
+        length the driver reports for the column. With encoding None
+        they are fetched as UTF-16 like the wide (NCHAR, NVARCHAR) columns.
+        With instrument, cursors record StatementStats (see
+        ohdbc.instrument).
+        """
+        self.env_h, self.api = env or shared_env()
+        self.connstr = connstr
+        self.encoding = encoding
+        self.max_char_bytes = max_char_bytes
+        self.instrument = instrument
         self.closed = False
+        self.statement_cache = StatementCache(statement_cache_size)
+        self._info = {}
         self.handle = ctypes.c_void_p()
         self.handle_type = SQL_HANDLE_DBC
         # allocate connection handle
@@ -41,10 +80,14 @@ class Connection:
         check_error(self, rc, 'allocate dbc handle')
         # connect
         connstr = utils.create_utf16_buffer(connstr)
+        start = perf_counter()
         rc = self.api.SQLDriverConnectW(
-            self.handle, None, ctypes.byref(connstr), ctypes.sizeof(connstr),
+            self.handle, None, ctypes.byref(connstr), SQL_NTS,
             None, 0, None, SQL_DRIVER_NOPROMPT)
+        self.connect_seconds = perf_counter() - start
         check_error(self, rc, 'connect (driver)')
+        if instrument:
+            emit('connect', self, self.connect_seconds)
         # set autocommit behavior
         rc = self.api.SQLSetConnectAttr(self.handle, SQL_ATTR_AUTOCOMMIT,
                                         SQL_AUTOCOMMIT_DEFAULT,
@@ -57,10 +100,50 @@ class Connection:
     def __exit__(self, *args, **kwargs):
         return self.close()
 
-    def close(self):
-        """Disconnect from the data source and free the handle"""
+    def rollback(self):
+        """Roll back the current transaction"""
         rc = self.api.SQLEndTran(SQL_HANDLE_DBC, self.handle, SQL_ROLLBACK)
         check_error(self, rc, 'rollback')
+
+    def commit(self):
+        """Commit the current transaction"""
+        rc = self.api.SQLEndTran(SQL_HANDLE_DBC, self.handle, SQL_COMMIT)
+        check_error(self, rc, 'commit')
+
+    def _info_bitmask(self, info_type, what):
+        """A bitmask SQLGetInfo value of the driver, asked once"""
+        if info_type not in self._info:
+            value = ctypes.c_uint()
+            rc = self.api.SQLGetInfoW(self.handle, info_type,
+                                      ctypes.byref(value),
+                                      ctypes.sizeof(value), None)
+            check_error(self, rc, 'get {}'.format(what))
+            self._info[info_type] = value.value
+        return self._info[info_type]
+
+    def getdata_extensions(self):
+        """SQL_GETDATA_EXTENSIONS bitmask of the driver"""
+        return self._info_bitmask(SQL_GETDATA_EXTENSIONS,
+                                  'getdata extensions')
+
+    def batch_support(self):
+        """SQL_BATCH_SUPPORT bitmask of the driver"""
+        return self._info_bitmask(SQL_BATCH_SUPPORT, 'batch support')
+
+    def is_alive(self):
+        """Ask the driver whether the connection is still usable"""
+        if self.closed:
+            return False
+        dead = ctypes.c_uint(SQL_CD_FALSE)
+        rc = self.api.SQLGetConnectAttr(self.handle, SQL_ATTR_CONNECTION_DEAD,
+                                        ctypes.byref(dead), 0, None)
+        return rc in (SQL_SUCCESS, SQL_SUCCESS_WITH_INFO) and \
+            dead.value == SQL_CD_FALSE
+
+    def close(self):
+        """Disconnect from the data source and free the handle"""
+        self.statement_cache.clear()
+        self.rollback()
         rc = self.api.SQLDisconnect(self.handle)
         check_error(self, rc, 'disconnect')
         rc = self.api.SQLFreeHandle(SQL_HANDLE_DBC, self.handle)
@@ -1,8 +1,125 @@
 import ctypes
+import operator
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
+from ohdbc import columnar
+from ohdbc.batch import Batch
+from ohdbc.exceptions import DatabaseError
+from ohdbc.instrument import StatementStats, perf_counter
+from ohdbc.lob import ChunkReader
 from ohdbc.sql import *
 from ohdbc.sqltypes import *
-from ohdbc.utils import check_error, c_utf_16_le
+from ohdbc.statement import BindPlan, PreparedStatement
+from ohdbc.utils import (StringDictionary, check_error, c_utf_16_le,
+                         char_codec, convert_column, create_utf16_buffer,
+                         decode_column, temporal_value)
+
+# A column as described by the driver, together with the buffers it is
+# bound to. The first six fields are the ones fetchmany always relied on.
+# Unbound columns are read with SQLGetData, their buff holds the values of
+# a fetched block. precision and scale are the column size and decimal
+# digits from the description, encoding is the codec of narrow text.
+BoundColumn = namedtuple('BoundColumn', [
+    'col_num', 'buff', 'indicator', 'is_char_array', 'is_fixed_width',
+    'nullable', 'name', 'sql_type', 'target_type', 'ctype', 'charsize',
+    'is_long', 'unbound', 'precision', 'scale', 'encoding'])
+
+# largest row array size picked by arraysize = 'auto'
+AUTO_ARRAYSIZE_MAX = 65536
+
+# dictionary_columns = 'auto' encodes the text columns of which the first
+# block has at most this many distinct values per row
+AUTO_DICTIONARY_RATIO = 0.5
+
+
+def make_row_struct(columns):
+    """Structure holding the value and indicator of every column of a row,
+    for row-wise binding"""
+    fields = []
+    for col in columns:
+        if col.unbound:
+            continue
+        if col.charsize:
+            fields.append(('v{}'.format(col.col_num),
+                           col.ctype * col.charsize))
+        else:
+            fields.append(('v{}'.format(col.col_num), col.ctype))
+        fields.append(('i{}'.format(col.col_num), ctypes.c_ssize_t))
+    return type('RowStruct', (ctypes.Structure,), {'_fields_': fields})
+
+
+def _row_converter(col, row_struct):
+    """Function (row number, row, row address) -> value of a column of a
+    row struct, None for unbound columns"""
+    if col.unbound:
+        return None
+    indicator = operator.attrgetter('i{}'.format(col.col_num))
+    if col.sql_type in TEMPORAL_SQL_TYPES:
+        value = operator.attrgetter('v{}'.format(col.col_num))
+        return lambda i, row, address: (
+            None if indicator(row) == SQL_NULL_DATA
+            else temporal_value(col, value(row)))
+    if col.target_type == SQL_C_BINARY:
+        offset = getattr(row_struct, 'v{}'.format(col.col_num)).offset
+        limit = col.charsize
+
+        def convert(i, row, address):
+            length = indicator(row)
+            if length < 0:
+                return None
+            if length > limit:
+                raise _truncated(col)
+            return ctypes.string_at(address + offset, length)
+        return convert
+    if not col.is_char_array:
+        value = operator.attrgetter('v{}'.format(col.col_num))
+        return lambda i, row, address: (
+            None if indicator(row) == SQL_NULL_DATA else value(row))
+    codec, unit, errors = char_codec(col)
+    offset = getattr(row_struct, 'v{}'.format(col.col_num)).offset
+    limit = _value_limit(col)
+    string_at = ctypes.string_at
+    if col.sql_type in DECIMAL_SQL_TYPES:
+        def convert(i, row, address):
+            length = indicator(row)
+            if length < 0:
+                return None
+            return Decimal(string_at(address + offset,
+                                     min(length, limit)).decode(codec))
+        return convert
+
+    def convert(i, row, address):
+        length = indicator(row)
+        if length < 0:
+            return None
+        if length > limit:
+            raise _truncated(col)
+        value = string_at(address + offset, length).decode(codec, errors)
+        return value.rstrip(' ') if col.is_fixed_width else value
+    return convert
+
+
+def _value_limit(col):
+    """Longest value in bytes that fits the buffer of a bound column"""
+    if col.target_type == SQL_C_BINARY:
+        return col.charsize
+    return col.charsize - char_codec(col)[1]
+
+
+def _truncated(col):
+    """Error for a value that didn't fit the buffer of a bound column"""
+    return DatabaseError(
+        "(fetch) value of column {} truncated to {} bytes, set a larger "
+        "max_char_bytes on the connection or a smaller long_column_size to "
+        "read it with SQLGetData".format(col.name, _value_limit(col)))
+
+
+def _unbound_converter(values):
+    """Row converter for a column read with SQLGetData"""
+    return lambda i, row, address: values[i]
 
 
 class Cursor:
@@ -10,28 +127,79 @@ class Cursor:
         """Return a database cursor"""
         self.conn = conn
         self.api = conn.api
-        self.handle = ctypes.c_void_p()
+        # bound function pointers for the hot paths
+        self._SQLExecute = conn.api.SQLExecute
+        self._SQLFetch = conn.api.SQLFetch
+        self.handle = None
         self.handle_type = SQL_HANDLE_STMT
+        # with instrument every execution records a StatementStats in stats
+        self.instrument = conn.instrument
+        self.stats = None
+        # rows per fetch, or 'auto' to fit the rows in max_buffer_bytes
         self.arraysize = 1
+        # upper bound for the memory of one set of bound column buffers
+        self.max_buffer_bytes = 32 * 1024 * 1024
+        # resize the row array between fetches to approach target_fetch_time
+        self.adaptive_arraysize = False
+        self.target_fetch_time = 0.05
+        self.rowset_size = 1
+        self._next_rowset_size = None
+        # fetch the next block in a worker thread while converting this one
+        self.prefetch = False
+        # 'column' binds an array per column, 'row' binds an array of
+        # structs holding a whole row (SQL_ATTR_ROW_BIND_TYPE)
+        self.bind_type = 'column'
+        self._row_struct = self._row_array = None
+        # character and binary columns of more than long_column_size
+        # characters or of unbounded size are not bound but read with
+        # SQLGetData in chunks of lob_chunk_size bytes, as values or, with
+        # stream_lobs, as file-like objects valid until the next fetch
+        self.long_column_size = 4000
+        self.lob_chunk_size = 64 * 1024
+        self.stream_lobs = False
+        self._unbound = []
+        self._lob_reader = None
+        # text columns (names or positions) to dictionary encode, so equal
+        # values share one str or, for Arrow, become dictionary arrays.
+        # 'auto' picks low cardinality columns from the first block of
+        # every result, for Python rows and NumPy. Past dictionary_max_size
+        # values rows and NumPy fall back to plain decoding, Arrow raises.
+        # Needs bind_type 'column'.
+        self.dictionary_columns = None
+        self.dictionary_max_size = 65536
+        self._dictionaries = {}
         self.stmt = None
-        rc = self.conn.api.SQLAllocHandle(SQL_HANDLE_STMT, conn.handle,
-                                          ctypes.byref(self.handle))
-        check_error(self, rc, 'allocate statement handle')
+        self._statement = None
+        self.return_buffer = []
+        self._param_buffers = None
+        self._prefetcher = None
+        # the last Batch of fetchbatch, still a view of the bound buffers
+        self._batch = None
+        # converted rows of the last block not yet returned by fetchmany(n)
+        self._row_buffer = None
+        self._row_pos = 0
 
     def set_options(self):
         """Set options for statement handle (cursor)"""
-        self.c_arraysize = ctypes.c_long(self.arraysize)
         rc = self.conn.api.SQLSetStmtAttr(self.handle, SQL_ATTR_ROW_ARRAY_SIZE,
-                                          self.c_arraysize, 0)
+                                          self.rowset_size, 0)
         check_error(self, rc, 'set row array size')
 
-        self.rowstatus = (ctypes.c_short * self.arraysize)()
+        if self._row_struct is not None:
+            bind_type = ctypes.sizeof(self._row_struct)
+        else:
+            bind_type = SQL_BIND_BY_COLUMN
+        rc = self.conn.api.SQLSetStmtAttr(self.handle, SQL_ATTR_ROW_BIND_TYPE,
+                                          bind_type, 0)
+        check_error(self, rc, 'set row bind type')
+
+        self.rowstatus = (ctypes.c_short * self.rowset_size)()
         p_rowstatus = ctypes.byref(self.rowstatus)
         rc = self.conn.api.SQLSetStmtAttr(self.handle, SQL_ATTR_ROW_STATUS_PTR,
                                           p_rowstatus, 0)
         check_error(self, rc, 'set rowstatus pointer')
 
-        self.rows_fetched = ctypes.c_long()
+        self.rows_fetched = ctypes.c_size_t()
         p_rows_fetched = ctypes.byref(self.rows_fetched)
         rc = self.conn.api.SQLSetStmtAttr(
             self.handle, SQL_ATTR_ROWS_FETCHED_PTR, p_rows_fetched, 0)
@@ -40,96 +208,844 @@ class Cursor:
     def __enter__(self):
         return self.close()
 
+    def __iter__(self):
+        """Iterate over the remaining rows, one block in memory at a time"""
+        while True:
+            rows = self.fetchmany()
+            if rows is None:
+                return
+            yield from rows
+
     def __exit__(self, *args, **kwargs):
         return self.close()
 
     def close(self):
-        """Close the cursor, free the handle"""
+        """Close the cursor, return its statement to the connection"""
+        self._release_statement()
         del self.return_buffer
-        rc = self.conn.api.SQLFreeHandle(SQL_HANDLE_STMT, self.handle)
-        check_error(self, rc, 'free handle')
         self.closed = True
 
     def prepare(self, stmt):
-        """Prepare statement"""
-        self.set_options()
-        stmt = bytes(stmt, 'utf-8')
-        self.stmt = stmt
-        c_stmt = ctypes.c_char_p(stmt)
-        rc = self.conn.api.SQLPrepare(self.handle, c_stmt, len(stmt))
-        check_error(self, rc, 'prepare stmt')
+        """Prepare statement, or take it from the connection's cache"""
+        sql = bytes(stmt, 'utf-8')
+        self._release_statement()
+        statement = self.conn.statement_cache.checkout(sql)
+        if statement is None and self.stats is not None:
+            statement = self._timed('prepare', PreparedStatement, self.conn,
+                                    sql)
+        elif statement is None:
+            statement = PreparedStatement(self.conn, sql)
+        self._statement = statement
+        self.handle = statement.handle
+        self.stmt = sql
+
+    def _release_statement(self):
+        """Reset the current statement and put it in the statement cache"""
+        statement = self._statement
+        if statement is None:
+            return
+        self._stop_prefetch()
+        # the bind plan goes back to the cache with the statement
+        self._detach_batch()
+        self._statement = self.handle = self.stmt = None
+        self._param_buffers = None
+        if self.conn.closed:
+            return
+        if not statement.prepared:
+            statement.free()
+            return
+        statement.reset()
+        self.conn.statement_cache.checkin(statement)
 
     def execute(self, stmt=None, params=None):
         """Execute (prepared) statement"""
-        if stmt is not None and self.stmt is None:
+        if stmt is None and (self._statement is None or
+                             not self._statement.prepared):
+            raise DatabaseError("(execute) no prepared statement to execute "
+                                "again, pass the SQL")
+        self._start_stats(stmt)
+        if stmt is not None and self.stmt != bytes(stmt, 'utf-8'):
             self.prepare(stmt)
 
-        rc = self.conn.api.SQLExecute(self.handle)
+        if params is not None:
+            self._bindparams([[value] for value in params])
+        elif self._param_buffers is not None:
+            self._resetparams()
+        return self._execute()
+
+    def executemany(self, stmt, seq_of_params):
+        """Execute statement for every sequence of params in one round trip,
+        by binding the params as column-wise arrays"""
+        self._start_stats(stmt)
+        if self.stmt != bytes(stmt, 'utf-8'):
+            self.prepare(stmt)
+        rows = list(seq_of_params)
+        if not rows:
+            return self
+        self._bindparams(list(zip(*rows)))
+        return self._execute()
+
+    def load_columns(self, stmt, columns):
+        """Execute statement for every row of a set of columns in one round
+        trip. columns is a mapping of name to NumPy (masked) array, in
+        placeholder order, or an Arrow table. Contiguous fixed width arrays
+        are bound without copying."""
+        self._start_stats(stmt)
+        if self.stmt != bytes(stmt, 'utf-8'):
+            self.prepare(stmt)
+        arrays = columnar.param_arrays(columns)
+        if not arrays or not len(arrays[0][0]):
+            return self
+        if len({len(values) for values, mask in arrays}) > 1:
+            raise ValueError("All columns must have the same length")
+        self._resetparams()
+        self._param_buffers = [
+            self._bindparam_array(param_num, values, mask)
+            for param_num, (values, mask) in enumerate(arrays, 1)]
+        self._set_paramset_size(len(arrays[0][0]))
+        return self._execute()
+
+    def _start_stats(self, stmt):
+        """Start new stats for an execution of stmt when instrumented"""
+        if not self.instrument:
+            self.stats = None
+            return
+        if stmt is None and self.stmt is not None:
+            stmt = self.stmt.decode('utf-8')
+        self.stats = StatementStats(stmt)
+
+    def _timed(self, event, func, *args):
+        """Call func, record its time as event in stats"""
+        start = perf_counter()
+        result = func(*args)
+        self.stats.record(event, self, perf_counter() - start)
+        return result
+
+    def _execute(self):
+        """Execute the prepared statement and bind the result columns"""
+        self._stop_prefetch()
+        self._row_buffer = None
+        if self._statement.columns:
+            # close the result set of the last execution, the bindings stay
+            rc = self.conn.api.SQLFreeStmt(self.handle, SQL_CLOSE)
+            check_error(self, rc, 'close cursor')
+        if self.stats is None:
+            rc = self._SQLExecute(self.handle)
+        else:
+            rc = self._timed('execute', self._SQLExecute, self.handle)
         check_error(self, rc, 'execute')
-        self.colcount = ctypes.c_short()
+        if self._param_buffers is not None:
+            self._check_param_status()
+        self._bind_result()
+        return self
 
-        rc = self.conn.api.SQLNumResultCols(self.handle,
-                                            ctypes.byref(self.colcount))
-        check_error(self, rc, 'get stmt column count')
-        self._bindcols()
+    def _bind_result(self):
+        """Bind the columns of the current result set, get its rowcount"""
+        if self.stats is None:
+            self._bindcols()
+        else:
+            self._timed('bind', self._bindcols)
 
         # get rowcount
-        self.rowcount = ctypes.c_long()
+        self.rowcount = ctypes.c_ssize_t()
         rc = self.conn.api.SQLRowCount(self.handle,
                                        ctypes.byref(self.rowcount))
         check_error(self, rc, 'get stmt rowcount')
+
+    def execute_batch(self, statements):
+        """Execute several statements in one SQLExecDirect round trip,
+        without preparing them. The cursor is positioned on the first
+        result, nextset moves to the results of the following statements.
+        """
+        if not self.conn.batch_support() & (SQL_BS_SELECT_EXPLICIT |
+                                            SQL_BS_ROW_COUNT_EXPLICIT):
+            raise NotImplementedError(
+                "The driver doesn't support batches of statements")
+        sql = ';\n'.join(stmt.rstrip().rstrip(';') for stmt in statements)
+        self._start_stats(sql)
+        self._release_statement()
+        self._statement = PreparedStatement(self.conn, bytes(sql, 'utf-8'),
+                                            prepare=False)
+        self._statement.multiple_results = True
+        self.handle = self._statement.handle
+        self._stop_prefetch()
+        self._row_buffer = None
+        text = create_utf16_buffer(sql)
+        if self.stats is None:
+            rc = self.conn.api.SQLExecDirectW(self.handle, ctypes.byref(text),
+                                              SQL_NTS)
+        else:
+            rc = self._timed('execute', self.conn.api.SQLExecDirectW,
+                             self.handle, ctypes.byref(text), SQL_NTS)
+        check_error(self, rc, 'execute batch')
+        self._bind_result()
         return self
 
-    def fetchmany(self, n=None):
-        """Fetch the next (set of) row(s)"""
-        if n is None:
-            n = self.arraysize
-        rc = self.conn.api.SQLFetch(self.handle)
+    def nextset(self):
+        """Skip the rest of the current result set and move to the next
+        one. Returns True, or None when there are no more result sets."""
+        self._stop_prefetch()
+        self._detach_batch()
+        self._row_buffer = None
+        rc = self.conn.api.SQLMoreResults(self.handle)
+        if rc == SQL_NO_DATA:
+            return None
+        check_error(self, rc, 'next result set')
+        self._statement.multiple_results = True
+        self._bind_result()
+        return True
+
+    def _fetch(self):
+        """Fetch the next block of rows into the bound buffers.
+        Returns the number of rows fetched, or None when exhausted."""
+        rc = self._SQLFetch(self.handle)
         if rc == SQL_NO_DATA:
             return None
         check_error(self, rc, 'fetch')
-        retcols = [[]] * self.colcount.value
-        for j, col in enumerate(self.return_buffer):
-            n_rows_to_fetch = range(self.rows_fetched.value)
-            all_rows = []
-            for i in n_rows_to_fetch:
-                length = col[2][i]
-                if length < 0:
-                    all_rows.append(None)
-                    continue
-                if col[3]:  # is_char_array
-                    value = col[1][i][:length]
-                    all_rows.append(value.decode('utf_16_le'))
+        return self.rows_fetched.value
+
+    def _fetch_block(self, columns):
+        """Fetch the next block into the bound buffers of columns and read
+        the unbound columns. Returns (columns, nrows) or None."""
+        if self.stats is not None:
+            return self._fetch_block_instrumented(columns)
+        nrows = self._fetch()
+        if nrows is None:
+            return None
+        self._check_truncation(columns, nrows)
+        if self._unbound:
+            columns = self._read_unbound(columns, nrows)
+        return columns, nrows
+
+    def _check_truncation(self, columns, nrows):
+        """Raise when a value didn't fit the buffer of a bound text or
+        binary column. Rows in a struct array are checked as they are
+        converted."""
+        if self._row_array is not None:
+            return
+        for col in columns:
+            if col.charsize and not col.unbound and \
+                    max(col.indicator[:nrows]) > _value_limit(col):
+                raise _truncated(col)
+
+    def _fetch_block_instrumented(self, columns):
+        """_fetch_block, recording the fetch and getdata times"""
+        stats = self.stats
+        nrows = self._timed('fetch', self._fetch)
+        if nrows is None:
+            return None
+        stats.rows += nrows
+        stats.bytes_fetched += nrows * self.row_width
+        self._check_truncation(columns, nrows)
+        if self._unbound:
+            start = perf_counter()
+            columns = self._read_unbound(columns, nrows)
+            stats.record('getdata', self, perf_counter() - start,
+                         self._lob_reader.calls)
+        return columns, nrows
+
+    def _read_unbound(self, columns, nrows):
+        """Read the unbound columns of every fetched row, return columns
+        with the values of each unbound column in its buff"""
+        reader = self._lob_reader
+        if reader is None or \
+                ctypes.sizeof(reader.scratch) != self.lob_chunk_size:
+            reader = self._lob_reader = ChunkReader(self, self.lob_chunk_size)
+        reader.generation += 1
+        reader.calls = 0
+        values = {col.col_num: [] for col in self._unbound}
+        for i in range(nrows):
+            if self.rowset_size > 1:
+                rc = self.conn.api.SQLSetPos(self.handle, i + 1,
+                                             SQL_POSITION, SQL_LOCK_NO_CHANGE)
+                check_error(self, rc, 'position on row {}'.format(i + 1))
+            for col in self._unbound:
+                if self.stream_lobs and col.is_long:
+                    value = reader.stream(col)
                 else:
-                    all_rows.append(col[1][i])
-            retcols[j] = all_rows
-        return zip(*retcols)
+                    value = reader.value(col)
+                values[col.col_num].append(value)
+        return [col._replace(buff=values[col.col_num]) if col.unbound
+                else col for col in columns]
+
+    def _fetch_into(self, columns):
+        """Bind a set of column buffers and fetch the next block into it"""
+        for col in columns:
+            self._bindcol(col)
+        return self._fetch_block(columns)
+
+    def _next_block(self, keep=False):
+        """Fetch the next block, return (columns, nrows) or None.
+        With keep the caller takes ownership of the returned buffers,
+        otherwise they are only valid until the next call."""
+        self._detach_batch()
+        if self.prefetch:
+            self._require_column_binding('prefetch')
+            self._require_values('prefetch')
+            return self._next_block_prefetch(keep)
+        if self._next_rowset_size is not None:
+            self._resize(self._next_rowset_size)
+        if not self.adaptive_arraysize:
+            block = self._fetch_block(self.return_buffer)
+        else:
+            start = time.perf_counter()
+            block = self._fetch_block(self.return_buffer)
+            if block is not None:
+                self._adapt_arraysize(time.perf_counter() - start, block[1])
+        if block is not None and keep:
+            self._rebind()
+        return block
+
+    def _detach_batch(self):
+        """Copy on advance, the buffers of the last Batch will be
+        overwritten"""
+        if self._batch is not None:
+            self._batch.detach()
+            self._batch = None
+
+    def _adapt_arraysize(self, elapsed, nrows):
+        """Plan a row array resize for the next fetch when the last one
+        was far off target_fetch_time"""
+        size = self.rowset_size
+        limit = min(self._max_rowset_size() or AUTO_ARRAYSIZE_MAX,
+                    AUTO_ARRAYSIZE_MAX)
+        if elapsed > 2 * self.target_fetch_time and size > 1:
+            self._next_rowset_size = size // 2
+        elif (elapsed < self.target_fetch_time / 2 and nrows == size and
+                size * 2 <= limit):
+            self._next_rowset_size = size * 2
+
+    def _resize(self, rowset_size):
+        """Change the row array size and rebind buffers of the new size"""
+        self._next_rowset_size = None
+        self.rowset_size = rowset_size
+        self.set_options()
+        self._rebind()
+
+    def _next_block_prefetch(self, keep):
+        """Double buffered _next_block: while the caller converts the
+        returned block, a worker thread fetches into the other buffers."""
+        if self._prefetcher is None:
+            # the buffer sets are swapped, the bind plan no longer holds
+            self._statement.bind_plan = None
+            self._prefetcher = ThreadPoolExecutor(max_workers=1)
+            self._pending = (self.return_buffer, self._prefetcher.submit(
+                self._fetch_into, self.return_buffer))
+            self._spare = [self._alloc_buffers(col)
+                           for col in self.return_buffer]
+        columns, future = self._pending
+        block = future.result()
+        if block is None:
+            self._stop_prefetch()
+            return None
+        spare = self._spare
+        self._pending = (spare, self._prefetcher.submit(self._fetch_into,
+                                                        spare))
+        if keep:
+            self._spare = [self._alloc_buffers(col) for col in columns]
+        else:
+            self._spare = columns
+        return block
 
-    def fetchall(self):
-        rows = []
+    def _stop_prefetch(self):
+        """Wait for an outstanding prefetch and shut down the worker"""
+        if self._prefetcher is None:
+            return
+        self._prefetcher.shutdown(wait=True)
+        self._prefetcher = None
+        self._pending = self._spare = None
+
+    def _iter_blocks(self, detach=False):
+        """Fetch all remaining blocks, yield (columns, nrows) for each.
+        With detach the yielded buffers are handed over to the caller."""
         while True:
-            r = self.fetchmany()
-            if not r:
-                break
-            rows.extend(list(r))
+            block = self._next_block(keep=detach)
+            if block is None:
+                return
+            yield block
+
+    def _require_column_binding(self, what):
+        if self._row_array is not None:
+            raise NotImplementedError(
+                "{} needs bind_type 'column'".format(what))
+
+    def _require_values(self, what):
+        if self.stream_lobs and any(col.is_long for col in self._unbound):
+            raise NotImplementedError(
+                "{} can't be used with stream_lobs".format(what))
+
+    def _require_unbuffered(self, what):
+        if self._row_buffer is not None:
+            raise NotImplementedError(
+                "{} can't be used while rows of the block fetchmany(n) "
+                "read are left, fetch those first".format(what))
+
+    def _convert_block(self, columns, nrows):
+        """Convert the first nrows of a block to a list of tuples"""
+        if self._row_array is not None:
+            return self._convert_rows(columns, nrows)
+        return list(zip(*self._convert_columns(columns, nrows)))
+
+    def _convert_block_columns(self, columns, nrows):
+        """Convert the first nrows of a block to one list per column"""
+        if self._row_array is not None:
+            return zip(*self._convert_rows(columns, nrows))
+        return self._convert_columns(columns, nrows)
+
+    def _convert_rows(self, columns, nrows):
+        """Convert the first nrows of the bound struct array to tuples"""
+        if self.dictionary_columns is not None:
+            self._require_column_binding('dictionary_columns')
+        size = ctypes.sizeof(self._row_struct)
+        address = ctypes.addressof(self._row_array)
+        converters = [convert or _unbound_converter(col.buff)
+                      for col, convert in zip(columns, self._row_converters)]
+        return [tuple([convert(i, row, address + i * size)
+                       for convert in converters])
+                for i, row in enumerate(self._row_array[:nrows])]
+
+    def _convert_columns(self, columns, nrows):
+        """Convert the first nrows of each bound column to Python lists"""
+        return [convert_column(col, nrows, self._decode_text)
+                for col in columns]
+
+    def _decode_text(self, col, nrows):
+        """Decode a bound text column, through its dictionary if it has
+        one"""
+        dictionary = self._dictionaries.get(col.col_num)
+        if dictionary is not None:
+            values = dictionary.decode(col, nrows)
+            if values is not None:
+                return values
+            # too many distinct values to be worth it
+            self._dictionaries[col.col_num] = None
+            return decode_column(col, nrows)
+        values = decode_column(col, nrows)
+        if self.dictionary_columns == 'auto' and \
+                col.col_num not in self._dictionaries:
+            self._dictionaries[col.col_num] = None
+            if len(set(values)) <= nrows * AUTO_DICTIONARY_RATIO:
+                dictionary = StringDictionary(self.dictionary_max_size)
+                self._dictionaries[col.col_num] = dictionary
+                values = dictionary.decode(col, nrows) or values
+        return values
+
+    def _init_dictionaries(self, columns):
+        """Start empty dictionaries for the chosen text columns"""
+        self._dictionaries = {}
+        if self.dictionary_columns in (None, 'auto'):
+            return
+        for j, col in enumerate(columns):
+            if (j in self.dictionary_columns or
+                    col.name in self.dictionary_columns) and \
+                    col.is_char_array and not col.unbound and \
+                    col.sql_type not in DECIMAL_SQL_TYPES:
+                self._dictionaries[col.col_num] = StringDictionary(
+                    self.dictionary_max_size)
+
+    def _arrow_dictionaries(self):
+        """Dictionaries of the columns that Arrow gets as dictionary
+        arrays, fixed before the first batch"""
+        if self.dictionary_columns == 'auto':
+            return {}
+        return self._dictionaries
+
+    def _fetch_rows(self):
+        """Fetch and convert the next block to a list of tuples, None
+        when exhausted"""
+        block = self._next_block()
+        if block is None:
+            return None
+        if self.stats is not None:
+            return self._timed('convert', self._convert_block, *block)
+        return self._convert_block(*block)
+
+    def _take_buffered(self, n=None):
+        """Up to n (by default all) buffered rows, None if there are
+        none"""
+        rows = self._row_buffer
+        if rows is None:
+            return None
+        pos = self._row_pos
+        if n is None or pos + n >= len(rows):
+            self._row_buffer = None
+            return rows[pos:] if pos else rows
+        self._row_pos = pos + n
+        return rows[pos:pos + n]
+
+    def fetchmany(self, n=None):
+        """Fetch the next n rows, fewer at the end of the result set.
+        Rows of a block that are not returned are kept for the next call,
+        so n doesn't have to match the row array size. Without n return
+        the rest of the current block, or the next whole block.
+        Returns None when the result set is exhausted."""
+        if n is None:
+            rows = self._take_buffered()
+            return rows if rows is not None else self._fetch_rows()
+        rows = self._take_buffered(n) or []
+        while len(rows) < n:
+            block = self._fetch_rows()
+            if block is None:
+                return rows or None
+            self._row_buffer = block
+            self._row_pos = 0
+            taken = self._take_buffered(n - len(rows))
+            if rows:
+                rows.extend(taken)
+            else:
+                rows = taken
         return rows
 
-    def _bindparams(self):
-        """Bind all params"""
-        raise NotImplementedError("Not yet implemented: parameter binding")
+    def fetchbatch(self):
+        """Fetch the next block of rows as a Batch, which decodes values
+        only when they are accessed. Returns None when exhausted."""
+        self._require_column_binding('fetchbatch')
+        self._require_values('fetchbatch')
+        self._require_unbuffered('fetchbatch')
+        block = self._next_block()
+        if block is None:
+            return None
+        self._batch = Batch(*block, decode=self._decode_text)
+        return self._batch
+
+    def fetch_batches(self):
+        """Iterate over all remaining blocks, as returned by fetchbatch"""
+        while True:
+            batch = self.fetchbatch()
+            if batch is None:
+                return
+            yield batch
+
+    def fetchall(self, columns=False):
+        """Fetch all remaining rows as a list of tuples, or with columns
+        as one list of values per column. Every block is converted straight
+        into the result, only one block of intermediates is alive."""
+        buffered = self._take_buffered() or []
+        if columns:
+            convert = self._convert_block_columns
+            result = [[] for col in self.return_buffer]
+            for column, values in zip(result, zip(*buffered)):
+                column.extend(values)
+        else:
+            convert = self._convert_block
+            result = buffered
+        for block in self._iter_blocks():
+            if self.stats is not None:
+                values = self._timed('convert', convert, *block)
+            else:
+                values = convert(*block)
+            if columns:
+                for column, block_values in zip(result, values):
+                    column.extend(block_values)
+            else:
+                result.extend(values)
+            del values
+        return result
+
+    def fetchnumpy(self):
+        """Fetch the next block of rows as one NumPy masked array per column.
+        Returns None when the result set is exhausted."""
+        self._require_column_binding('fetchnumpy')
+        self._require_values('fetchnumpy')
+        self._require_unbuffered('fetchnumpy')
+        block = self._next_block()
+        if block is None:
+            return None
+        if self.stats is not None:
+            return self._timed('convert', columnar.to_numpy, *block,
+                               self._decode_text)
+        return columnar.to_numpy(*block, decode=self._decode_text)
+
+    def fetch_batches_numpy(self):
+        """Iterate over all remaining blocks, as returned by fetchnumpy"""
+        while True:
+            batch = self.fetchnumpy()
+            if batch is None:
+                return
+            yield batch
+
+    def fetch_arrow_batches(self):
+        """Iterate over all remaining blocks as Arrow RecordBatches"""
+        self._require_column_binding('fetch_arrow_batches')
+        self._require_values('fetch_arrow_batches')
+        self._require_unbuffered('fetch_arrow_batches')
+        dictionaries = self._arrow_dictionaries()
+        schema = columnar.arrow_schema(self.return_buffer, dictionaries)
+        for columns, nrows in self._iter_blocks(detach=True):
+            if self.stats is not None:
+                yield self._timed('convert', columnar.to_arrow, columns,
+                                  nrows, schema, dictionaries)
+                continue
+            yield columnar.to_arrow(columns, nrows, schema, dictionaries)
+
+    def export(self, path, format='csv', compression=None):
+        """Write all remaining rows to a 'csv' or 'parquet' file, one
+        fetched block at a time, without building Python rows.
+        compression is an Arrow codec name such as 'gzip' or 'zstd'.
+        Returns the number of rows written."""
+        self._require_column_binding('export')
+        self._require_values('export')
+        self._require_unbuffered('export')
+        dictionaries = self._arrow_dictionaries()
+        schema = columnar.arrow_schema(self.return_buffer, dictionaries)
+        return columnar.export(self._iter_blocks(), schema, path, format,
+                               compression, dictionaries)
+
+    def fetch_arrow_table(self):
+        """Fetch all remaining rows into an Arrow Table"""
+        self._require_unbuffered('fetch_arrow_table')
+        schema = columnar.arrow_schema(self.return_buffer,
+                                       self._arrow_dictionaries())
+        return columnar.pyarrow.Table.from_batches(
+            list(self.fetch_arrow_batches()), schema=schema)
+
+    def _bindparams(self, columns):
+        """Bind all params, one sequence of values per placeholder"""
+        self._resetparams()
+        paramset_size = len(columns[0]) if columns else 1
+        self._param_buffers = [self._bindparam(param_num, values)
+                               for param_num, values
+                               in enumerate(columns, 1)]
+        self._set_paramset_size(paramset_size)
 
-    def _bindparam(self):
-        """Bind a parameter for a placeholder"""
-        raise NotImplementedError("Not yet implemented")
+    def _set_paramset_size(self, paramset_size):
+        """Set the number of parameter sets and the arrays for their
+        status and the number of sets processed"""
+        rc = self.conn.api.SQLSetStmtAttr(self.handle, SQL_ATTR_PARAMSET_SIZE,
+                                          paramset_size, 0)
+        check_error(self, rc, 'set paramset size')
+
+        self.param_status = (ctypes.c_ushort * paramset_size)()
+        rc = self.conn.api.SQLSetStmtAttr(
+            self.handle, SQL_ATTR_PARAM_STATUS_PTR,
+            ctypes.byref(self.param_status), 0)
+        check_error(self, rc, 'set param status pointer')
+
+        self.params_processed = ctypes.c_size_t()
+        rc = self.conn.api.SQLSetStmtAttr(
+            self.handle, SQL_ATTR_PARAMS_PROCESSED_PTR,
+            ctypes.byref(self.params_processed), 0)
+        check_error(self, rc, 'set params processed pointer')
+
+    def _resetparams(self):
+        """Unbind all params and go back to a single parameter set"""
+        if self._param_buffers is None:
+            return
+        rc = self.conn.api.SQLFreeStmt(self.handle, SQL_RESET_PARAMS)
+        check_error(self, rc, 'reset params')
+        self._set_paramset_size(1)
+        self._param_buffers = None
+
+    def _check_param_status(self):
+        """Raise if the driver reported errors for any parameter set"""
+        processed = self.params_processed.value
+        failed = [i for i, status in enumerate(self.param_status[:processed])
+                  if status == SQL_PARAM_ERROR]
+        if failed:
+            raise DatabaseError('(execute) {} of {} parameter sets failed, '
+                                'first at row {}'.format(
+                                    len(failed), processed, failed[0]))
+
+    def _bindparam(self, param_num, values):
+        """Bind an array of values for a placeholder, return the buffers"""
+        size = len(values)
+        kinds = {type(value) for value in values if value is not None}
+        indicator = (ctypes.c_ssize_t * size)()
+        if kinds and kinds <= {int, bool}:
+            c_type, sql_type, column_size = SQL_C_SBIGINT, SQL_BIGINT, 19
+            buff = (ctypes.c_longlong * size)(
+                *[0 if value is None else value for value in values])
+            stride = ctypes.sizeof(ctypes.c_longlong)
+        elif kinds and kinds <= {int, bool, float}:
+            c_type, sql_type, column_size = SQL_C_DOUBLE, SQL_DOUBLE, 15
+            buff = (ctypes.c_double * size)(
+                *[0 if value is None else value for value in values])
+            stride = ctypes.sizeof(ctypes.c_double)
+        else:
+            if kinds and kinds <= {bytes, bytearray}:
+                c_type, sql_type, unit = SQL_C_BINARY, SQL_VARBINARY, 1
+                encoded = list(values)
+            else:
+                # anything else is sent as text and converted by the driver
+                c_type, sql_type, unit = SQL_C_WCHAR, SQL_WVARCHAR, 2
+                encoded = [None if value is None else
+                           str(value).encode('utf_16_le') for value in values]
+            lengths = [0 if value is None else len(value)
+                       for value in encoded]
+            stride = max(lengths) + unit
+            column_size = max(1, max(lengths) // unit)
+            buff = ((ctypes.c_char * stride) * size).from_buffer_copy(
+                b''.join((value or b'').ljust(stride, b'\x00')
+                         for value in encoded))
+        for i, value in enumerate(values):
+            if value is None:
+                indicator[i] = SQL_NULL_DATA
+            elif c_type in (SQL_C_WCHAR, SQL_C_BINARY):
+                indicator[i] = lengths[i]
+            else:
+                indicator[i] = stride
+        self._bind_param_buffer(param_num, c_type, sql_type, column_size,
+                                ctypes.byref(buff), stride,
+                                ctypes.byref(indicator))
+        return buff, indicator
+
+    def _bindparam_array(self, param_num, values, mask):
+        """Bind a NumPy array for a placeholder, return the buffers"""
+        param = columnar.numpy_param(values, mask)
+        if param is None:
+            values = values.tolist()
+            if mask is not None:
+                values = [None if null else value
+                          for value, null in zip(values, mask)]
+            return self._bindparam(param_num, values)
+        (c_type, sql_type, column_size, decimal_digits, data, stride,
+         indicator) = param
+        self._bind_param_buffer(param_num, c_type, sql_type, column_size,
+                                ctypes.c_void_p(data.ctypes.data), stride,
+                                ctypes.c_void_p(indicator.ctypes.data),
+                                decimal_digits)
+        return data, indicator
+
+    def _bind_param_buffer(self, param_num, c_type, sql_type, column_size,
+                           p_buff, stride, p_indicator, decimal_digits=0):
+        rc = self.conn.api.SQLBindParameter(
+            self.handle, param_num, SQL_PARAM_INPUT, c_type, sql_type,
+            column_size, decimal_digits, p_buff, stride, p_indicator)
+        check_error(self, rc, 'bind param {}'.format(param_num))
 
     def _bindcols(self):
-        """Loop over all cols and bind them"""
-        self.return_buffer = []
-        for col in range(1, self.colcount.value + 1):
+        """Describe all cols, size the row array, allocate and bind them.
+        The description and the bound buffers are kept with the prepared
+        statement and reused as long as the result shape and the row array
+        size stay the same."""
+        statement = self._statement
+        self.colcount = ctypes.c_short()
+        rc = self.conn.api.SQLNumResultCols(self.handle,
+                                            ctypes.byref(self.colcount))
+        check_error(self, rc, 'get stmt column count')
+        columns = statement.columns
+        if statement.multiple_results:
+            # every result set has its own columns
+            rc = self.conn.api.SQLFreeStmt(self.handle, SQL_UNBIND)
+            check_error(self, rc, 'unbind cols')
+            columns = None
+        if columns is None or len(columns) != self.colcount.value:
+            statement.bind_plan = None
+            columns = statement.columns = self._describecols()
+        self._unbound = [col for col in columns if col.unbound]
+        self._check_streams()
+        self._init_dictionaries(columns)
+        self.row_width = self._row_width(columns)
+        rowset_size = self._choose_rowset_size()
+        self._next_rowset_size = None
+        rowwise = self.bind_type == 'row'
+        plan = statement.bind_plan
+        if plan is not None and plan.rowset_size == rowset_size and \
+                (plan.row_array is not None) == rowwise:
+            self.rowset_size = rowset_size
+            self.return_buffer = plan.columns
+            self.rowstatus = plan.rowstatus
+            self.rows_fetched = plan.rows_fetched
+            self._row_array = plan.row_array
+            self._row_struct = type(plan.row_array)._type_ if rowwise else None
+            self._set_row_converters()
+            return
+        self.rowset_size = rowset_size
+        self._row_struct = make_row_struct(columns) if rowwise else None
+        self.set_options()
+        self._alloc_and_bind(columns)
+        self._set_row_converters()
+        statement.bind_plan = BindPlan(rowset_size, self.return_buffer,
+                                       self.rowstatus, self.rows_fetched,
+                                       self._row_array)
+
+    def _set_row_converters(self):
+        if self._row_struct is None:
+            self._row_converters = None
+            return
+        self._row_converters = [_row_converter(col, self._row_struct)
+                                for col in self.return_buffer]
+
+    def _describecols(self):
+        """Describe all result columns of the executed statement"""
+        columns = [self._describecol(col_num)
+                   for col_num in range(1, self.colcount.value + 1)]
+        long_cols = [j for j, col in enumerate(columns) if col.is_long]
+        if long_cols and not \
+                self.conn.getdata_extensions() & SQL_GD_ANY_COLUMN:
+            # SQLGetData only works on the columns after the last bound one
+            columns[long_cols[0]:] = [col._replace(unbound=True)
+                                      for col in columns[long_cols[0]:]]
+        return columns
+
+    def _check_streams(self):
+        """Streams are read after the row has been fetched, so without
+        SQL_GD_ANY_ORDER no column may be read with SQLGetData after them"""
+        if not self.stream_lobs or \
+                self.conn.getdata_extensions() & SQL_GD_ANY_ORDER:
+            return
+        cols = self._unbound
+        streamed = [j for j, col in enumerate(cols) if col.is_long]
+        if streamed and not all(col.is_long for col in cols[streamed[0]:]):
+            raise NotImplementedError(
+                "stream_lobs needs the long columns after all other "
+                "unbound columns for this driver")
+
+    @staticmethod
+    def _row_width(columns):
+        """Bytes of bound buffer needed for one row"""
+        width = ctypes.sizeof(ctypes.c_short)  # row status
+        for col in columns:
+            if col.unbound:
+                continue
+            width += ctypes.sizeof(col.ctype) * (col.charsize or 1)
+            width += ctypes.sizeof(ctypes.c_ssize_t)  # indicator
+        return width
+
+    def _max_rowset_size(self):
+        """Largest row array size that fits in max_buffer_bytes"""
+        if self._unbound and (self.stream_lobs or not
+                              self.conn.getdata_extensions() & SQL_GD_BLOCK):
+            # SQLGetData can only read from a rowset of one row
+            return 1
+        if not self.max_buffer_bytes:
+            return None
+        buffer_sets = 2 if self.prefetch else 1
+        return max(1, self.max_buffer_bytes //
+                   (self.row_width * buffer_sets))
+
+    def _choose_rowset_size(self):
+        """Row array size to use, from arraysize and the memory budget"""
+        limit = self._max_rowset_size()
+        if self.arraysize == 'auto':
+            if limit is None:
+                return AUTO_ARRAYSIZE_MAX
+            return min(limit, AUTO_ARRAYSIZE_MAX)
+        if limit is None:
+            return self.arraysize
+        return min(self.arraysize, limit)
+
+    def _rebind(self):
+        """Bind newly allocated buffers to all columns"""
+        self._statement.bind_plan = None
+        self._alloc_and_bind(self.return_buffer)
+
+    def _alloc_and_bind(self, columns):
+        """Allocate buffers of rowset_size for all columns and bind them"""
+        if self._row_struct is not None:
+            self._row_array = (self._row_struct * self.rowset_size)()
+            for col in columns:
+                if not col.unbound:
+                    self._bindcol_rowwise(col)
+            self.return_buffer = columns
+            return
+        self._row_array = None
+        self.return_buffer = [self._alloc_buffers(col) for col in columns]
+        for col in self.return_buffer:
             self._bindcol(col)
 
-    def _bindcol(self, col_num):
-        """Get col description and then bind the col"""
+    def _describecol(self, col_num):
+        """Get col description, return an unbound BoundColumn"""
         col_name = ctypes.create_string_buffer(256)
         col_name_size = ctypes.c_short()
         col_type = ctypes.c_short()
@@ -138,40 +1054,102 @@ class Cursor:
         col_nullable = ctypes.c_short()
         rc = self.conn.api.SQLDescribeColW(
             self.handle, col_num, ctypes.byref(col_name),
-            ctypes.sizeof(col_name), ctypes.byref(col_name_size),
+            ctypes.sizeof(col_name) // 2, ctypes.byref(col_name_size),
             ctypes.byref(col_type), ctypes.byref(col_type_size),
             ctypes.byref(col_dec_digits), ctypes.byref(col_nullable))
         check_error(self, rc, 'request col {}'.format(col_num))
         col_name_decoded = col_name[:col_name_size.value*2].decode('utf_16_le')
-        nullable = bool(1-col_nullable.value)
-        # print('col #{} name: {}, type: {}, size: {} nullable: {}'.format(
-        #     col_num, col_name_decoded, col_type.value, col_type_size.value,
-        #     nullable))
-        c_col_type = SQL_TYPE_MAP[col_type.value]
+        nullable = col_nullable.value != SQL_NO_NULLS
+        sql_type = col_type.value
+        size = col_type_size.value
+        scale = col_dec_digits.value
+        # narrow text is fetched as SQL_C_CHAR in the client encoding,
+        # wide text (or all text without an encoding) as SQL_C_WCHAR
+        encoding = self.conn.encoding
+        wide = sql_type in WIDE_SQL_CHAR or encoding is None
+        if sql_type in LONG_SQL_TYPES or (
+                sql_type in ALL_SQL_CHAR + ALL_SQL_BINARY and
+                (size == 0 or size > self.long_column_size)):
+            is_char_array = sql_type not in ALL_SQL_BINARY
+            if not is_char_array:
+                target_type = SQL_C_BINARY
+            else:
+                target_type = SQL_C_WCHAR if wide else SQL_C_CHAR
+            return BoundColumn(col_num, None, None, is_char_array, False,
+                               nullable, col_name_decoded, sql_type,
+                               target_type, ctypes.c_char, None, True, True,
+                               size, scale, encoding)
+        ctype = SQL_TYPE_MAP[sql_type]
+        target_type = SQL_C_TYPE_MAP.get(sql_type, sql_type)
         charsize = None
         is_char_array = False
         is_fixed_width = False
-        if col_type.value in ALL_SQL_CHAR:
+        if sql_type in ALL_SQL_CHAR:
             is_char_array = True
-            c_col_type = ctypes.c_char
-            charsize = col_type_size.value + 1
-            if col_type.value in (SQL_CHAR, SQL_WCHAR):
-                is_fixed_width = True
-                col_type.value = SQL_CHAR
-            elif col_type.value in (SQL_WCHAR, SQL_WVARCHAR, SQL_WLONGVARCHAR):
-                # ODBC Unicode != utf-8; can't use the ctypes c_wchar
-                charsize = col_type_size.value * 2 + 2
-                col_type.value = SQL_WCHAR
-            col_buff = ((c_col_type * charsize) * self.arraysize)()
+            is_fixed_width = sql_type in (SQL_CHAR, SQL_WCHAR)
+            # ODBC Unicode != utf-8; can't use the ctypes c_wchar
+            ctype = ctypes.c_char
+            if wide:
+                charsize = size * 2 + 2
+                target_type = SQL_C_WCHAR
+            else:
+                charsize = self._narrow_octets(col_num, size) + 1
+                target_type = SQL_C_CHAR
+        elif sql_type in DECIMAL_SQL_TYPES:
+            # sign, leading zero, decimal point and terminator
+            is_char_array = True
+            charsize = size + 4
+        elif sql_type in ALL_SQL_BINARY:
+            # bytes, no terminator
+            charsize = max(size, 1)
+        return BoundColumn(col_num, None, None, is_char_array, is_fixed_width,
+                           nullable, col_name_decoded, sql_type, target_type,
+                           ctype, charsize, False, False, size, scale,
+                           encoding)
+
+    def _narrow_octets(self, col_num, size):
+        """Bytes a value of a narrow text column takes: max_char_bytes per
+        character, or the octet length the driver reports"""
+        if self.conn.max_char_bytes is not None:
+            return size * self.conn.max_char_bytes
+        length = ctypes.c_ssize_t()
+        rc = self.conn.api.SQLColAttributeW(
+            self.handle, col_num, SQL_DESC_OCTET_LENGTH, None, 0, None,
+            ctypes.byref(length))
+        check_error(self, rc, 'request octet length of col {}'.format(
+            col_num))
+        return max(length.value, size)
+
+    def _alloc_buffers(self, col):
+        """Allocate value and indicator arrays of rowset_size for a column"""
+        if col.unbound:
+            return col
+        if col.charsize:
+            col_buff = ((col.ctype * col.charsize) * self.rowset_size)()
         else:
-            col_buff = (c_col_type * self.arraysize)()
-        if col_type.value == SQL_BIGINT:
-            col_type.value = -25  # SQL_C_BIGINT
-        col_indicator = (ctypes.c_ssize_t * self.arraysize)()
-        self.return_buffer.append((col_num, col_buff, col_indicator,
-                                   is_char_array, is_fixed_width, nullable))
-        # Bind the column
-        rc = self.conn.api.SQLBindCol(self.handle, col_num, col_type.value,
-                                      ctypes.byref(col_buff), charsize,
-                                      ctypes.byref(col_indicator))
-        check_error(self, rc, 'bind col {}'.format(col_num))
+            col_buff = (col.ctype * self.rowset_size)()
+        col_indicator = (ctypes.c_ssize_t * self.rowset_size)()
+        return col._replace(buff=col_buff, indicator=col_indicator)
+
+    def _bindcol_rowwise(self, col):
+        """Bind a column to its fields in the struct array"""
+        address = ctypes.addressof(self._row_array)
+        value = getattr(self._row_struct, 'v{}'.format(col.col_num))
+        indicator = getattr(self._row_struct, 'i{}'.format(col.col_num))
+        rc = self.conn.api.SQLBindCol(self.handle, col.col_num,
+                                      col.target_type,
+                                      address + value.offset,
+                                      col.charsize or 0,
+                                      address + indicator.offset)
+        check_error(self, rc, 'bind col {}'.format(col.col_num))
+
+    def _bindcol(self, col):
+        """Bind the buffers of a column"""
+        if col.unbound:
+            return
+        rc = self.conn.api.SQLBindCol(self.handle, col.col_num,
+                                      col.target_type,
+                                      ctypes.byref(col.buff),
+                                      col.charsize or 0,
+                                      ctypes.byref(col.indicator))
+        check_error(self, rc, 'bind col {}'.format(col.col_num))
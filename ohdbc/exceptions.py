@@ -4,3 +4,7 @@ class Error(Exception):
 
 class DatabaseError(Error):
     pass
+
+
+class OperationalError(DatabaseError):
+    pass
@@ -0,0 +1,74 @@
+"""
+Instrumentation
+
+Opt-in timings and counters for the hot paths. With
+Connection(instrument=True), or cursor.instrument = True, every execution
+gets a StatementStats in cursor.stats. Listeners added with add_listener
+are called with (event, source, seconds) after every timed step:
+
+    connect   SQLDriverConnectW, source is the Connection
+    prepare   SQLPrepare (not called for cached statements)
+    execute   SQLExecute
+    bind      describing and binding the result columns
+    fetch     one SQLFetch of a block of rows
+    getdata   reading the unbound columns of a block with SQLGetData
+    convert   converting a block to Python rows, NumPy or Arrow
+
+Uninstrumented cursors only pay for a check of cursor.stats per block.
+"""
+
+import time
+
+_listeners = []
+
+perf_counter = time.perf_counter
+
+
+def add_listener(listener):
+    """Call listener(event, source, seconds) for every instrumented step"""
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+
+def emit(event, source, seconds):
+    for listener in list(_listeners):
+        listener(event, source, seconds)
+
+
+class StatementStats:
+    def __init__(self, sql):
+        """Timings and counters of one execution of sql.
+        seconds and calls are per event, round trips are the calls of
+        SQLExecute, SQLFetch and SQLGetData."""
+        self.sql = sql
+        self.seconds = {}
+        self.calls = {}
+        self.rows = 0
+        self.bytes_fetched = 0
+        self.round_trips = 0
+
+    def __repr__(self):
+        return '<StatementStats rows={} round_trips={} seconds={}>'.format(
+            self.rows, self.round_trips, self.seconds)
+
+    def record(self, event, source, seconds, calls=1):
+        """Add the time and calls of an event and tell the listeners"""
+        self.seconds[event] = self.seconds.get(event, 0.0) + seconds
+        self.calls[event] = self.calls.get(event, 0) + calls
+        if event in ('execute', 'fetch', 'getdata'):
+            self.round_trips += calls
+        if _listeners:
+            emit(event, source, seconds)
+
+    def as_dict(self):
+        """Flat dict of all counters, for exporting as metrics"""
+        stats = {'sql': self.sql, 'rows': self.rows,
+                 'bytes_fetched': self.bytes_fetched,
+                 'round_trips': self.round_trips}
+        for event, seconds in self.seconds.items():
+            stats['{}_seconds'.format(event)] = seconds
+            stats['{}_calls'.format(event)] = self.calls[event]
+        return stats
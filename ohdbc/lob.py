@@ -0,0 +1,121 @@
+"""
+Long columns
+
+Columns of unbounded or very large size are not bound to a buffer per
+row. Once the row they are in has been fetched, their values are read
+with SQLGetData a chunk at a time into one reused scratch buffer, so the
+memory used for them does not depend on the declared column size.
+"""
+
+import ctypes
+import io
+from decimal import Decimal
+
+from ohdbc.exceptions import DatabaseError
+from ohdbc.sql import *
+from ohdbc.sqltypes import *
+from ohdbc.utils import check_error, char_codec, temporal_value
+
+
+class ChunkReader:
+    def __init__(self, stmt, chunk_size):
+        """Read unbound columns of the current row of stmt, an object with
+        api, handle and handle_type. generation is advanced by the cursor
+        on every fetch, streams of older rows can no longer be read."""
+        self.stmt = stmt
+        self.scratch = ctypes.create_string_buffer(chunk_size)
+        self.indicator = ctypes.c_ssize_t()
+        self.generation = 0
+        # SQLGetData calls, for instrumentation
+        self.calls = 0
+
+    def chunk(self, col):
+        """Read the next chunk of col in the current row.
+        Returns (data, more), data is None for NULL."""
+        # the driver null terminates character data
+        unit = 0 if col.target_type == SQL_C_BINARY else char_codec(col)[1]
+        avail = ctypes.sizeof(self.scratch) - unit
+        self.calls += 1
+        rc = self.stmt.api.SQLGetData(
+            self.stmt.handle, col.col_num, col.target_type, self.scratch,
+            ctypes.sizeof(self.scratch), ctypes.byref(self.indicator))
+        if rc == SQL_NO_DATA:
+            return b'', False
+        check_error(self.stmt, rc, 'get data col {}'.format(col.col_num))
+        length = self.indicator.value
+        if length == SQL_NULL_DATA:
+            return None, False
+        if length != SQL_NO_TOTAL and length <= avail:
+            return ctypes.string_at(self.scratch, length), False
+        return ctypes.string_at(self.scratch, avail), True
+
+    def value(self, col):
+        """Read the whole value of col in the current row"""
+        if not col.is_char_array and col.target_type != SQL_C_BINARY:
+            value = col.ctype()
+            self.calls += 1
+            rc = self.stmt.api.SQLGetData(
+                self.stmt.handle, col.col_num, col.target_type,
+                ctypes.byref(value), ctypes.sizeof(value),
+                ctypes.byref(self.indicator))
+            check_error(self.stmt, rc, 'get data col {}'.format(col.col_num))
+            if self.indicator.value == SQL_NULL_DATA:
+                return None
+            if col.sql_type in TEMPORAL_SQL_TYPES:
+                return temporal_value(col, value)
+            return value.value
+        chunks = []
+        more = True
+        while more:
+            data, more = self.chunk(col)
+            if data is None:
+                return None
+            chunks.append(data)
+        raw = b''.join(chunks)
+        if not col.is_char_array:
+            return raw
+        codec, unit, errors = char_codec(col)
+        value = raw.decode(codec, errors)
+        if col.sql_type in DECIMAL_SQL_TYPES:
+            return Decimal(value)
+        return value.rstrip(' ') if col.is_fixed_width else value
+
+    def stream(self, col):
+        """File-like object over the value of col in the current row.
+        Text columns give a text stream, binary columns a binary one."""
+        raw = LobStream(self, col)
+        if not col.is_char_array:
+            return raw
+        codec, unit, errors = char_codec(col)
+        return io.TextIOWrapper(
+            io.BufferedReader(raw, ctypes.sizeof(self.scratch)),
+            encoding=codec, errors=errors)
+
+
+class LobStream(io.RawIOBase):
+    def __init__(self, reader, col):
+        """Raw stream over the value of a long column, read on demand.
+        NULL reads as empty. Only valid until the next fetch and, unless
+        the driver supports SQL_GD_ANY_ORDER, streams of a row have to be
+        read in column order."""
+        super().__init__()
+        self.reader = reader
+        self.col = col
+        self.generation = reader.generation
+        self._pending = b''
+        self._more = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._pending and self._more:
+            if self.reader.generation != self.generation:
+                raise DatabaseError("(read lob) the cursor has moved past "
+                                    "the row of this stream")
+            data, self._more = self.reader.chunk(self.col)
+            self._pending = data or b''
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
@@ -0,0 +1,169 @@
+"""
+Parallel partitioned extraction
+
+A query is split into n partitions by a predicate on one column, either
+modulo (column mod n = i) or key ranges between bounds, and every
+partition is fetched on its own Connection in a thread pool. The ODBC
+calls release the GIL, so the partitions fetch concurrently.
+
+    for batch in parallel_extract(connstr, 'SELECT * FROM big', 'id', 8):
+        ...
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ohdbc.connection import Connection
+
+# how long a blocked worker waits before checking whether to stop
+_POLL_INTERVAL = 0.1
+
+
+def partition_predicates(partition_column, n_partitions, bounds=None):
+    """WHERE clauses splitting a query into n_partitions.
+    Without bounds the rows are split by the column modulo n_partitions,
+    which needs an integer column. With bounds=(low, high) the range is
+    cut into equal key ranges, the first and last are open ended.
+    NULLs go to the first partition."""
+    if n_partitions < 1:
+        raise ValueError("n_partitions must be at least 1")
+    col = partition_column
+    if n_partitions == 1:
+        return ['1 = 1']
+    if bounds is None:
+        # MOD keeps the sign of the column, shift negative remainders
+        predicates = ['{{fn MOD({{fn MOD({}, {})}} + {}, {})}} = {}'.format(
+            col, n_partitions, n_partitions, n_partitions, i)
+            for i in range(n_partitions)]
+    else:
+        low, high = bounds
+        step = (high - low) / n_partitions
+        cuts = [low + step * i for i in range(1, n_partitions)]
+        if all(isinstance(b, int) for b in bounds):
+            cuts = [int(cut) for cut in cuts]
+        predicates = ['{} < {}'.format(col, cuts[0])]
+        predicates += ['{} >= {} AND {} < {}'.format(col, lo, col, hi)
+                       for lo, hi in zip(cuts, cuts[1:])]
+        predicates.append('{} >= {}'.format(col, cuts[-1]))
+    predicates[0] = '({}) OR {} IS NULL'.format(predicates[0], col)
+    return predicates
+
+
+def partition_queries(sql, partition_column, n_partitions, bounds=None):
+    """The query for every partition of sql"""
+    return ['SELECT * FROM ({}) ohdbc_partition WHERE {}'.format(sql, where)
+            for where in partition_predicates(partition_column,
+                                              n_partitions, bounds)]
+
+
+def _open_cursor(connstr, query, arraysize, kwargs):
+    conn = Connection(connstr, **kwargs)
+    cur = conn.cursor()
+    cur.arraysize = arraysize
+    cur.execute(query)
+    return conn, cur
+
+
+def _batches(cur, arrow):
+    if arrow:
+        yield from cur.fetch_arrow_batches()
+        return
+    while True:
+        rows = cur.fetchmany()
+        if rows is None:
+            return
+        yield list(rows)
+
+
+def parallel_extract(connstr, sql, partition_column, n_partitions,
+                     workers=None, bounds=None, output_dir=None,
+                     arraysize='auto', arrow=False, format='csv',
+                     compression=None, **kwargs):
+    """Fetch sql in n_partitions partitions on up to workers connections.
+    Returns an iterator of batches (lists of rows, or Arrow RecordBatches
+    with arrow) in the order they arrive, or with output_dir exports every
+    partition to its own file there (see Cursor.export) and returns the
+    file paths. kwargs are passed on to every Connection."""
+    queries = partition_queries(sql, partition_column, n_partitions, bounds)
+    workers = min(workers or n_partitions, n_partitions)
+    if output_dir is not None:
+        return _extract_files(connstr, queries, workers, output_dir,
+                              arraysize, format, compression, kwargs)
+    return _extract_batches(connstr, queries, workers, arraysize, arrow,
+                            kwargs)
+
+
+def _write_partition(connstr, query, path, arraysize, format, compression,
+                     kwargs):
+    conn, cur = _open_cursor(connstr, query, arraysize, kwargs)
+    try:
+        cur.export(path, format, compression)
+    finally:
+        cur.close()
+        conn.close()
+    return path
+
+
+def _extract_files(connstr, queries, workers, output_dir, arraysize,
+                   format, compression, kwargs):
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(
+            _write_partition, connstr, query,
+            os.path.join(output_dir, 'part-{:05d}.{}'.format(i, format)),
+            arraysize, format, compression, kwargs)
+            for i, query in enumerate(queries)]
+        return [future.result() for future in futures]
+
+
+def _extract_batches(connstr, queries, workers, arraysize, arrow, kwargs):
+    # bounded, so workers wait while the consumer falls behind
+    batches = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def extract(query):
+        if stop.is_set():
+            return
+        try:
+            conn, cur = _open_cursor(connstr, query, arraysize, kwargs)
+            try:
+                for batch in _batches(cur, arrow):
+                    if not put(batch):
+                        return
+            finally:
+                cur.close()
+                conn.close()
+        except BaseException as e:
+            put(e)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(extract, query) for query in queries]
+    try:
+        while True:
+            try:
+                item = batches.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if all(future.done() for future in futures) and \
+                        batches.empty():
+                    return
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # partitions that haven't started are not run at all
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,175 @@
+"""
+Connection pool
+
+Keeps connected Connections per connection string, so short queries
+don't pay for a full SQLDriverConnectW handshake. All connections share
+one ODBC environment handle.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from ohdbc.connection import Connection, _init_env, shared_env
+from ohdbc.exceptions import Error, OperationalError
+
+
+class ConnectionPool:
+    def __init__(self, min_size=0, max_size=10, idle_timeout=300,
+                 health_check=True, driver_pooling=False, **kwargs):
+        """Create a pool of at most max_size connections per connection
+        string, of which min_size are kept open even when idle.
+        Other idle connections are closed after idle_timeout seconds.
+        With health_check a connection is asked whether it is still alive
+        before it is handed out. driver_pooling also turns on the pooling
+        of the driver manager, with a new environment for this pool. Note
+        that SQL_ATTR_CONNECTION_POOLING is a process-wide attribute: every
+        environment allocated afterwards is pooled by the driver manager
+        as well, including the shared one if it hasn't been created yet,
+        and closing its connections keeps them open in that pool.
+        kwargs are passed on to every Connection.
+        """
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Need 0 <= min_size <= max_size and max_size > 0")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.kwargs = kwargs
+        self.env = _init_env(pooling=True) if driver_pooling else shared_env()
+        self.closed = False
+        self._idle = {}  # connstr: [(connection, released at)]
+        self._size = {}  # connstr: number of open connections
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        return self.close()
+
+    def _connect(self, connstr):
+        return Connection(connstr, env=self.env, **self.kwargs)
+
+    def _discard(self, conn):
+        try:
+            if not conn.closed:
+                conn.close()
+        except Error:
+            pass
+
+    def _expire(self, now):
+        """Remove the idle connections past idle_timeout of every
+        connection string, keep min_size open for each. Returns the
+        removed connections, must be called with the lock."""
+        expired = []
+        for connstr, idle in self._idle.items():
+            while idle and self._size[connstr] > self.min_size and \
+                    now - idle[0][1] > self.idle_timeout:
+                expired.append(idle.pop(0)[0])
+                self._size[connstr] -= 1
+        return expired
+
+    def warm_up(self, connstr):
+        """Open connections for connstr until min_size are open"""
+        while True:
+            with self._cond:
+                if self._size.get(connstr, 0) >= self.min_size:
+                    return
+                self._size[connstr] = self._size.get(connstr, 0) + 1
+            conn = self._create(connstr)
+            with self._cond:
+                self._idle.setdefault(connstr, []).append(
+                    (conn, time.monotonic()))
+                self._cond.notify()
+
+    def _create(self, connstr):
+        """Connect for a slot that has already been counted in _size"""
+        try:
+            return self._connect(connstr)
+        except Exception:
+            with self._cond:
+                self._size[connstr] -= 1
+                self._cond.notify()
+            raise
+
+    def acquire(self, connstr, timeout=None):
+        """Get a connection for connstr, waiting at most timeout seconds
+        for one to be released when max_size are in use"""
+        if connstr not in self._size:
+            self.warm_up(connstr)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self.closed:
+                        raise OperationalError("Connection pool is closed")
+                    now = time.monotonic()
+                    expired = self._expire(now)
+                    idle = self._idle.get(connstr)
+                    if idle:
+                        # most recently used first, it is the most likely
+                        # to still be alive
+                        conn = idle.pop()[0]
+                        break
+                    if self._size.get(connstr, 0) < self.max_size:
+                        self._size[connstr] = self._size.get(connstr, 0) + 1
+                        break
+                    if deadline is not None and now >= deadline:
+                        raise OperationalError(
+                            "Timed out waiting for a pooled connection")
+                    self._cond.wait(None if deadline is None
+                                    else deadline - now)
+            for old in expired:
+                self._discard(old)
+            if conn is None:
+                return self._create(connstr)
+            if not self.health_check or conn.is_alive():
+                return conn
+            self._forget(conn, connstr)
+
+    def _forget(self, conn, connstr):
+        """Close a connection and free its slot"""
+        self._discard(conn)
+        with self._cond:
+            self._size[connstr] -= 1
+            self._cond.notify()
+
+    def release(self, conn):
+        """Return a connection acquired from this pool"""
+        connstr = conn.connstr
+        if conn.closed or self.closed:
+            return self._forget(conn, connstr)
+        try:
+            conn.rollback()
+        except Error:
+            return self._forget(conn, connstr)
+        with self._cond:
+            now = time.monotonic()
+            self._idle.setdefault(connstr, []).append((conn, now))
+            expired = self._expire(now)
+            self._cond.notify()
+        for old in expired:
+            self._discard(old)
+
+    @contextmanager
+    def connection(self, connstr, timeout=None):
+        """Context manager that acquires and releases a connection"""
+        conn = self.acquire(connstr, timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close all idle connections, connections in use are closed when
+        they are released"""
+        with self._cond:
+            self.closed = True
+            idle = [conn for conns in self._idle.values()
+                    for conn, released in conns]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
@@ -1,5 +1,3 @@
-import ctypes
-
 # *************************************************
 #* sql.py
 #*
@@ -179,8 +177,19 @@ SQL_WLONGVARCHAR = -10
 
 ALL_SQL_CHAR = (SQL_CHAR, SQL_WCHAR, SQL_VARCHAR, SQL_WVARCHAR,
                 SQL_WLONGVARCHAR)
+WIDE_SQL_CHAR = (SQL_WCHAR, SQL_WVARCHAR, SQL_WLONGVARCHAR)
 
+SQL_LONGVARCHAR = (-1)
+SQL_BINARY = (-2)
+SQL_VARBINARY = (-3)
+SQL_LONGVARBINARY = (-4)
 SQL_BIGINT = -5
+SQL_TINYINT = (-6)
+SQL_BIT = (-7)
+
+ALL_SQL_BINARY = (SQL_BINARY, SQL_VARBINARY, SQL_LONGVARBINARY)
+# types of unbounded size, never bound to a buffer per row
+LONG_SQL_TYPES = (SQL_LONGVARCHAR, SQL_WLONGVARCHAR, SQL_LONGVARBINARY)
 
 #  One-parameter shortcuts for date/time data types #
 #if (ODBCVER >= 0x0300)
@@ -591,8 +600,8 @@ SQL_ATTR_TRANSLATE_OPTION = SQL_TRANSLATE_OPTION
 SQL_ATTR_TXN_ISOLATION = SQL_TXN_ISOLATION
 
 # /* SQL_AUTOCOMMIT options */
-SQL_AUTOCOMMIT_OFF = ctypes.c_ulong(0)
-SQL_AUTOCOMMIT_ON = ctypes.c_ulong(1)
+SQL_AUTOCOMMIT_OFF = 0
+SQL_AUTOCOMMIT_ON = 1
 SQL_AUTOCOMMIT_DEFAULT = SQL_AUTOCOMMIT_ON
 
 # /* whether an attribute is a pointer or not */
@@ -638,6 +647,7 @@ SQL_ATTR_QUERY_TIMEOUT = SQL_QUERY_TIMEOUT
 SQL_ATTR_RETRIEVE_DATA = SQL_RETRIEVE_DATA
 SQL_ATTR_ROW_BIND_OFFSET_PTR = 23
 SQL_ATTR_ROW_BIND_TYPE = SQL_BIND_TYPE
+SQL_BIND_BY_COLUMN = 0
 SQL_ATTR_ROW_NUMBER = SQL_ROW_NUMBER
 SQL_ATTR_ROW_OPERATION_PTR = 24
 SQL_ATTR_ROW_STATUS_PTR = 25
@@ -645,3 +655,44 @@ SQL_ATTR_ROWS_FETCHED_PTR = 26
 SQL_ATTR_ROW_ARRAY_SIZE = 27
 SQL_ATTR_SIMULATE_CURSOR = SQL_SIMULATE_CURSOR
 SQL_ATTR_USE_BOOKMARKS = SQL_USE_BOOKMARKS
+
+# /* parameter binding */
+SQL_PARAM_TYPE_UNKNOWN = 0
+SQL_PARAM_INPUT = 1
+SQL_PARAM_INPUT_OUTPUT = 2
+SQL_RESULT_COL = 3
+SQL_PARAM_OUTPUT = 4
+SQL_RETURN_VALUE = 5
+
+# /* values for SQL_ATTR_PARAM_STATUS_PTR */
+SQL_PARAM_SUCCESS = 0
+SQL_PARAM_SUCCESS_WITH_INFO = 6
+SQL_PARAM_ERROR = 5
+SQL_PARAM_UNUSED = 7
+SQL_PARAM_DIAG_UNAVAILABLE = 1
+
+# /* C datatype to SQL datatype mapping */
+SQL_SIGNED_OFFSET = (-20)
+SQL_UNSIGNED_OFFSET = (-22)
+SQL_C_CHAR = SQL_CHAR
+SQL_C_WCHAR = SQL_WCHAR
+SQL_C_LONG = SQL_INTEGER
+SQL_C_SHORT = SQL_SMALLINT
+SQL_C_FLOAT = SQL_REAL
+SQL_C_DOUBLE = SQL_DOUBLE
+SQL_C_NUMERIC = SQL_NUMERIC
+SQL_C_DEFAULT = 99
+SQL_C_BINARY = SQL_BINARY
+SQL_C_BIT = SQL_BIT
+SQL_C_SBIGINT = (SQL_BIGINT + SQL_SIGNED_OFFSET)
+SQL_C_UBIGINT = (SQL_BIGINT + SQL_UNSIGNED_OFFSET)
+SQL_C_TINYINT = SQL_TINYINT
+SQL_C_SLONG = (SQL_C_LONG + SQL_SIGNED_OFFSET)
+SQL_C_SSHORT = (SQL_C_SHORT + SQL_SIGNED_OFFSET)
+SQL_C_STINYINT = (SQL_TINYINT + SQL_SIGNED_OFFSET)
+SQL_C_ULONG = (SQL_C_LONG + SQL_UNSIGNED_OFFSET)
+SQL_C_USHORT = (SQL_C_SHORT + SQL_UNSIGNED_OFFSET)
+SQL_C_UTINYINT = (SQL_TINYINT + SQL_UNSIGNED_OFFSET)
+SQL_C_TYPE_DATE = SQL_TYPE_DATE
+SQL_C_TYPE_TIME = SQL_TYPE_TIME
+SQL_C_TYPE_TIMESTAMP = SQL_TYPE_TIMESTAMP
@@ -2,6 +2,24 @@ import ctypes
 
 from .sql import *
 
+
+class SQL_DATE_STRUCT(ctypes.Structure):
+    _fields_ = [('year', ctypes.c_short), ('month', ctypes.c_ushort),
+                ('day', ctypes.c_ushort)]
+
+
+class SQL_TIME_STRUCT(ctypes.Structure):
+    _fields_ = [('hour', ctypes.c_ushort), ('minute', ctypes.c_ushort),
+                ('second', ctypes.c_ushort)]
+
+
+class SQL_TIMESTAMP_STRUCT(ctypes.Structure):
+    _fields_ = [('year', ctypes.c_short), ('month', ctypes.c_ushort),
+                ('day', ctypes.c_ushort), ('hour', ctypes.c_ushort),
+                ('minute', ctypes.c_ushort), ('second', ctypes.c_ushort),
+                ('fraction', ctypes.c_uint)]  # nanoseconds
+
+
 SQL_TYPE_MAP = {
     SQL_INTEGER: ctypes.c_int,
     SQL_CHAR: ctypes.c_char,
@@ -12,11 +30,62 @@ SQL_TYPE_MAP = {
     SQL_SMALLINT: ctypes.c_short,
     SQL_BIGINT: ctypes.c_longlong,
     SQL_DOUBLE: ctypes.c_double,
+    SQL_FLOAT: ctypes.c_double,
+    SQL_REAL: ctypes.c_float,
+    # fetched as text, converted to Decimal or scaled integers
+    SQL_DECIMAL: ctypes.c_char,
+    SQL_NUMERIC: ctypes.c_char,
+    # fixed stride byte strings
+    SQL_BINARY: ctypes.c_char,
+    SQL_VARBINARY: ctypes.c_char,
+    SQL_TYPE_DATE: SQL_DATE_STRUCT,
+    SQL_TYPE_TIME: SQL_TIME_STRUCT,
+    SQL_TYPE_TIMESTAMP: SQL_TIMESTAMP_STRUCT,
 }
 
+# SQL type -> C type to bind as, where it differs from the SQL type code
+SQL_C_TYPE_MAP = {
+    SQL_BIGINT: SQL_C_SBIGINT,
+    SQL_FLOAT: SQL_C_DOUBLE,
+    SQL_DECIMAL: SQL_C_CHAR,
+    SQL_NUMERIC: SQL_C_CHAR,
+    SQL_VARBINARY: SQL_C_BINARY,
+}
+
+TEMPORAL_SQL_TYPES = (SQL_TYPE_DATE, SQL_TYPE_TIME, SQL_TYPE_TIMESTAMP)
+DECIMAL_SQL_TYPES = (SQL_DECIMAL, SQL_NUMERIC)
+
 # types from sqlext.h
 SQL_ATTR_ODBC_VERSION = 200
-SQL_OV_ODBC3 = ctypes.c_ulong(3)
+SQL_OV_ODBC3 = 3
+
+# /* driver manager connection pooling */
+SQL_ATTR_CONNECTION_POOLING = 201
+SQL_ATTR_CP_MATCH = 202
+SQL_CP_OFF = 0
+SQL_CP_ONE_PER_DRIVER = 1
+SQL_CP_ONE_PER_HENV = 2
+
+# /* SQL_ATTR_CONNECTION_DEAD values */
+SQL_ATTR_CONNECTION_DEAD = 1209
+SQL_CD_TRUE = 1
+SQL_CD_FALSE = 0
+
+# /* SQLGetData length indicator and SQL_GETDATA_EXTENSIONS bitmasks */
+SQL_NO_TOTAL = -4
+SQL_GD_BLOCK = 0x00000004
+SQL_GD_BOUND = 0x00000008
+
+# /* SQL_BATCH_SUPPORT info type and bitmasks */
+SQL_BATCH_SUPPORT = 121
+SQL_BS_SELECT_EXPLICIT = 0x00000001
+SQL_BS_ROW_COUNT_EXPLICIT = 0x00000002
+SQL_BS_SELECT_PROC = 0x00000004
+SQL_BS_ROW_COUNT_PROC = 0x00000008
+
+# /* SQLSetPos operation and lock type */
+SQL_POSITION = 0
+SQL_LOCK_NO_CHANGE = 0
 
 # /* Options for SQLDriverConnect */
 SQL_DRIVER_NOPROMPT = 0
@@ -0,0 +1,103 @@
+import ctypes
+import threading
+from collections import OrderedDict, namedtuple
+
+from ohdbc.sql import *
+from ohdbc.utils import check_error
+
+# Column buffers (or the struct array for row-wise binding) bound to a
+# statement handle, with the row status and rows fetched the handle points
+# to, for a given row array size
+BindPlan = namedtuple('BindPlan', ['rowset_size', 'columns', 'rowstatus',
+                                   'rows_fetched', 'row_array'])
+
+
+class PreparedStatement:
+    def __init__(self, conn, sql, prepare=True):
+        """Allocate a statement handle and prepare sql (utf-8 bytes) on it.
+        columns holds the described result columns after the first
+        execution, so later executions can skip describing them, and the
+        bind plan of the buffers its result columns are bound to.
+        Without prepare only the handle is allocated, for SQLExecDirect.
+        multiple_results is set once a second result set was seen, the
+        result columns are then described again for every result set."""
+        self.api = conn.api
+        self.handle = ctypes.c_void_p()
+        self.handle_type = SQL_HANDLE_STMT
+        self.sql = sql
+        self.prepared = prepare
+        self.multiple_results = False
+        self.columns = None
+        self.bind_plan = None
+        rc = self.api.SQLAllocHandle(SQL_HANDLE_STMT, conn.handle,
+                                     ctypes.byref(self.handle))
+        check_error(self, rc, 'allocate statement handle')
+        if not prepare:
+            return
+        try:
+            rc = self.api.SQLPrepare(self.handle, ctypes.c_char_p(sql),
+                                     len(sql))
+            check_error(self, rc, 'prepare stmt')
+        except Exception:
+            self.free()
+            raise
+
+    def reset(self):
+        """Close the result set and drop all bindings and pointers into
+        memory of the cursor that used this statement. Column bindings
+        owned by the bind plan are kept."""
+        options = [SQL_CLOSE, SQL_RESET_PARAMS]
+        attrs = [SQL_ATTR_PARAM_STATUS_PTR, SQL_ATTR_PARAMS_PROCESSED_PTR]
+        if self.bind_plan is None:
+            options.append(SQL_UNBIND)
+            attrs += [SQL_ATTR_ROW_STATUS_PTR, SQL_ATTR_ROWS_FETCHED_PTR]
+        for option in options:
+            rc = self.api.SQLFreeStmt(self.handle, option)
+            check_error(self, rc, 'free stmt')
+        for attr in attrs:
+            rc = self.api.SQLSetStmtAttr(self.handle, attr, None, 0)
+            check_error(self, rc, 'reset stmt pointer')
+        rc = self.api.SQLSetStmtAttr(self.handle, SQL_ATTR_PARAMSET_SIZE, 1, 0)
+        check_error(self, rc, 'reset paramset size')
+
+    def free(self):
+        """Free the statement handle"""
+        rc = self.api.SQLFreeHandle(SQL_HANDLE_STMT, self.handle)
+        check_error(self, rc, 'free handle')
+
+
+class StatementCache:
+    def __init__(self, size):
+        """LRU cache of prepared statements that are not in use by a
+        cursor, keyed by SQL text. Evicted statements are freed."""
+        self.size = size
+        self._statements = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._statements)
+
+    def checkout(self, sql):
+        """Take the prepared statement for sql out of the cache, or None"""
+        with self._lock:
+            return self._statements.pop(sql, None)
+
+    def checkin(self, statement):
+        """Put a statement that is no longer in use back in the cache"""
+        evicted = []
+        with self._lock:
+            if statement.sql in self._statements:
+                evicted.append(self._statements.pop(statement.sql))
+            self._statements[statement.sql] = statement
+            while len(self._statements) > max(self.size, 0):
+                evicted.append(self._statements.popitem(last=False)[1])
+        for old in evicted:
+            old.free()
+
+    def clear(self):
+        """Free all cached statements"""
+        with self._lock:
+            statements = list(self._statements.values())
+            self._statements.clear()
+        for statement in statements:
+            statement.free()
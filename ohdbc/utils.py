@@ -1,7 +1,18 @@
 import ctypes
+import datetime
+import struct
+from decimal import Decimal
 
 from ohdbc.exceptions import DatabaseError
 from ohdbc.sql import *
+from ohdbc.sqltypes import *
+
+# struct module formats of the date, time and timestamp structs
+TEMPORAL_FORMATS = {
+    SQL_TYPE_DATE: '=hHH',
+    SQL_TYPE_TIME: '=HHH',
+    SQL_TYPE_TIMESTAMP: '=hHHHHHI',
+}
 
 
 def check_error(obj, ret, message):
@@ -10,14 +21,15 @@ def check_error(obj, ret, message):
         return
 
     if obj.handle_type in (SQL_HANDLE_DBC, SQL_HANDLE_ENV, SQL_HANDLE_STMT):
-        sql_state = ctypes.create_string_buffer(10)
-        native_error = ctypes.c_short()
-        message_text = ctypes.create_string_buffer(500)
+        # SQLWCHAR buffers: 5 character state plus terminator
+        sql_state = ctypes.create_string_buffer(12)
+        native_error = ctypes.c_int()
+        message_text = ctypes.create_string_buffer(1024)
         message_length = ctypes.c_short()
         obj.api.SQLGetDiagRecW(
             obj.handle_type, obj.handle, 1, ctypes.byref(sql_state),
             ctypes.byref(native_error), ctypes.byref(message_text),
-            ctypes.sizeof(message_text), ctypes.byref(message_length))
+            ctypes.sizeof(message_text) // 2, ctypes.byref(message_length))
         error_msg = "({}) [{}] {}".format(message,
                                           sql_state.raw.decode('utf_16_le'),
                                           message_text.raw.decode('utf_16_le'))
@@ -32,6 +44,171 @@ def bufread(array):
     return array.raw.decode('utf_16_le')
 
 
+def char_codec(col):
+    """Codec, bytes per code unit and decode error handler for a bound
+    character column"""
+    if col.target_type == SQL_WCHAR:
+        return 'utf_16_le', 2, 'surrogatepass'
+    return col.encoding or 'utf_8', 1, 'surrogateescape'
+
+
+def decode_column(col, nrows):
+    """Decode the first nrows of a bound character column to a list
+
+    When the values fill most of the buffer, the whole buffer is decoded in
+    one call and each value is sliced from the result at the fixed stride
+    of the buffer. This only works when every code unit decodes to exactly
+    one character. Otherwise, or when the buffer is mostly padding, the
+    values are decoded one by one.
+    """
+    codec, unit, errors = char_codec(col)
+    width = col.charsize
+    # values longer than the buffer are truncated by the driver
+    limit = width - unit
+    indicator = col.indicator[:nrows]
+    filled = sum([min(length, limit) for length in indicator if length > 0])
+    if filled * 2 >= nrows * width:
+        raw = ctypes.string_at(col.buff, nrows * width)
+        text = raw.decode(codec, errors)
+        stride = width // unit
+        if len(text) == nrows * stride:
+            values = [text[start:start + min(length, limit) // unit]
+                      if length >= 0 else None
+                      for start, length in zip(range(0, len(text), stride),
+                                               indicator)]
+        else:
+            values = [raw[start:start + min(length, limit)].decode(codec,
+                                                                   errors)
+                      if length >= 0 else None
+                      for start, length in zip(range(0, len(raw), width),
+                                               indicator)]
+    else:
+        view = memoryview(col.buff).cast('B')
+        values = [str(view[start:start + min(length, limit)], codec, errors)
+                  if length >= 0 else None
+                  for start, length in zip(range(0, nrows * width, width),
+                                           indicator)]
+    if col.is_fixed_width:
+        values = [value.rstrip(' ') if value is not None else None
+                  for value in values]
+    return values
+
+
+class StringDictionary:
+    def __init__(self, max_size):
+        """Distinct values of a text column, carried across fetches.
+        Every distinct raw value is decoded once and gets a code, its
+        position in values. decode gives up past max_size values."""
+        self.max_size = max_size
+        self.codes = {}  # raw bytes: code
+        self.values = []
+        # the values as Arrow array, see ohdbc.columnar.ArrowValues
+        self.arrow = None
+
+    def code(self, col, raw):
+        """Code of a raw value of col, added if it is new"""
+        code = self.codes.get(raw)
+        if code is None:
+            codec, unit, errors = char_codec(col)
+            value = raw.decode(codec, errors)
+            if col.is_fixed_width:
+                value = value.rstrip(' ')
+            code = self.codes[raw] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, col, nrows):
+        """Decode the first nrows of a bound character column to a list
+        in which equal values are the same str object. Returns None when
+        the column has more than max_size distinct values."""
+        unit = char_codec(col)[1]
+        limit = col.charsize - unit
+        raw = ctypes.string_at(col.buff, nrows * col.charsize)
+        codes = self.codes
+        values = self.values
+        result = []
+        for start, length in zip(range(0, len(raw), col.charsize),
+                                 col.indicator[:nrows]):
+            if length < 0:
+                result.append(None)
+                continue
+            key = raw[start:start + min(length, limit)]
+            code = codes.get(key)
+            if code is None:
+                if len(values) >= self.max_size:
+                    return None
+                code = self.code(col, key)
+            result.append(values[code])
+        return result
+
+
+def _temporal_factory(sql_type):
+    """Function from the fields of a date, time or timestamp struct to
+    the Python object"""
+    if sql_type == SQL_TYPE_DATE:
+        return datetime.date
+    if sql_type == SQL_TYPE_TIME:
+        return datetime.time
+
+    def timestamp(year, month, day, hour, minute, second, fraction):
+        return datetime.datetime(year, month, day, hour, minute, second,
+                                 fraction // 1000)
+    return timestamp
+
+
+def decode_temporal(col, nrows):
+    """Convert the first nrows of a bound date, time or timestamp column
+    to a list, unpacking the whole buffer in one call"""
+    make = _temporal_factory(col.sql_type)
+    raw = ctypes.string_at(col.buff, nrows * ctypes.sizeof(col.ctype))
+    indicator = col.indicator[:nrows]
+    return [make(*fields) if length != SQL_NULL_DATA else None
+            for fields, length in zip(
+                struct.iter_unpack(TEMPORAL_FORMATS[col.sql_type], raw),
+                indicator)]
+
+
+def temporal_value(col, value):
+    """Python object for a single date, time or timestamp struct"""
+    return _temporal_factory(col.sql_type)(
+        *[getattr(value, name) for name, ctype in value._fields_])
+
+
+def binary_column(col, nrows):
+    """Bytes of the first nrows of a bound binary column, as a list"""
+    width = col.charsize
+    raw = ctypes.string_at(col.buff, nrows * width)
+    return [raw[start:start + length] if length >= 0 else None
+            for start, length in zip(range(0, len(raw), width),
+                                     col.indicator[:nrows])]
+
+
+def to_decimals(values):
+    """Convert decimal strings to Decimal, keeping None"""
+    return [None if value is None else Decimal(value) for value in values]
+
+
+def convert_column(col, nrows, decode=decode_column):
+    """Convert the first nrows of a bound column to a list of Python
+    values, text is decoded with decode(col, nrows)"""
+    if col.unbound:
+        return col.buff
+    if col.sql_type in DECIMAL_SQL_TYPES:
+        return to_decimals(decode_column(col, nrows))
+    if col.is_char_array:
+        return decode(col, nrows)
+    if col.sql_type in TEMPORAL_SQL_TYPES:
+        return decode_temporal(col, nrows)
+    if col.target_type == SQL_C_BINARY:
+        return binary_column(col, nrows)
+    values = col.buff[:nrows]
+    if col.nullable:
+        indicator = col.indicator[:nrows]
+        values = [None if length == SQL_NULL_DATA else value
+                  for value, length in zip(values, indicator)]
+    return values
+
+
 class Error(Exception):
     """Default Error as defined in DBAPI 2.0"""
 
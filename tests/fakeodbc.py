@@ -0,0 +1,352 @@
+"""
+In-memory fake of the ODBC API, enough of it to run a cursor without a
+driver manager. Tables map SQL (utf-8 bytes) to (columns, rows), columns
+are (name, sql type, size, scale, nullable[, octet length]) tuples. SQL
+without a table executes without a result set; every execution appends
+(sql, parameter rows) to FakeAPI.executed. SQLExecDirectW runs a batch of
+statements separated by ';\n', with a result for each.
+"""
+
+import ctypes
+import datetime
+import itertools
+
+from ohdbc.connection import Connection
+from ohdbc.sql import *
+from ohdbc.sqltypes import *
+
+COLUMNS = [('id', SQL_INTEGER, 10, 0, False),
+           ('name', SQL_VARCHAR, 10, 0, True),
+           ('w', SQL_WVARCHAR, 10, 0, True),
+           ('x', SQL_DOUBLE, 15, 0, True)]
+
+
+def make_rows(n, tag=''):
+    return [(i, None if i % 3 == 0 else '{}n{}'.format(tag, i),
+             'w{}'.format(i % 2), i / 2) for i in range(n)]
+
+
+LOB_COLUMNS = [('id', SQL_INTEGER, 10, 0, False),
+               ('doc', SQL_WLONGVARCHAR, 0, 0, True),
+               ('blob', SQL_LONGVARBINARY, 0, 0, True),
+               ('note', SQL_VARCHAR, 5000, 0, True),
+               ('x', SQL_DOUBLE, 15, 0, True)]
+
+
+def lob_rows(n):
+    return [(i, None if i == 1 else 'dé€{}'.format(i) * (i * 7),
+             bytes(range(i * 3 % 256)) * i, None if i == 2 else 'n' * i,
+             i / 4) for i in range(n)]
+
+
+# C types of the fixed size buffers, anything else is a C int
+C_TYPES = {SQL_C_DOUBLE: ctypes.c_double,
+           SQL_C_FLOAT: ctypes.c_float,
+           SQL_C_SBIGINT: ctypes.c_longlong,
+           SQL_C_SHORT: ctypes.c_short,
+           SQL_C_TYPE_DATE: SQL_DATE_STRUCT,
+           SQL_C_TYPE_TIME: SQL_TIME_STRUCT,
+           SQL_C_TYPE_TIMESTAMP: SQL_TIMESTAMP_STRUCT}
+
+
+def _address(p):
+    if p is None or isinstance(p, int):
+        return p
+    if isinstance(p, ctypes.c_void_p):
+        return p.value
+    if hasattr(p, '_obj'):
+        return ctypes.addressof(p._obj)
+    return ctypes.addressof(p)
+
+
+class Statement:
+    def __init__(self):
+        self.sql = None
+        self.attrs = {SQL_ATTR_ROW_ARRAY_SIZE: 1, SQL_ATTR_ROW_BIND_TYPE: 0}
+        self.binds = {}
+        self.params = {}
+        self.open = False
+        self.pos = 0
+        # first row of the fetched block, row SQLGetData reads from and
+        # the bytes of each column read from it
+        self.block = self.row = 0
+        self.offsets = {}
+        self.cols = self.rows = None
+        # results of the rest of a batch, for SQLMoreResults
+        self.results = []
+
+
+class FakeAPI:
+    def __init__(self, tables):
+        self.tables = tables
+        self.handles = {}
+        self.ids = itertools.count(1000)
+        self.errors = []
+        self.executed = []
+        # parameter set numbers reported as failed
+        self.failed_paramsets = set()
+        # handles of connections that report SQL_ATTR_CONNECTION_DEAD
+        self.dead = set()
+        # SQLGetInfo values, anything else reports every bit set
+        self.info = {}
+
+    def _statement(self, handle):
+        return self.handles[_address(handle)]
+
+    def SQLAllocHandle(self, handle_type, parent, p):
+        handle = next(self.ids)
+        self.handles[handle] = Statement() \
+            if handle_type == SQL_HANDLE_STMT else object()
+        ctypes.c_void_p.from_address(_address(p)).value = handle
+        return SQL_SUCCESS
+
+    def SQLSetEnvAttr(self, *args):
+        return SQL_SUCCESS
+
+    SQLDriverConnectW = SQLSetConnectAttr = SQLEndTran = SQLSetEnvAttr
+    SQLDisconnect = SQLFreeHandle = SQLGetDiagRecW = SQLSetEnvAttr
+    SQLRowCount = SQLSetEnvAttr
+
+    def SQLGetConnectAttr(self, handle, attr, p, length, p_length):
+        assert attr == SQL_ATTR_CONNECTION_DEAD
+        ctypes.c_uint.from_address(_address(p)).value = \
+            SQL_CD_TRUE if _address(handle) in self.dead else SQL_CD_FALSE
+        return SQL_SUCCESS
+
+    def SQLGetInfoW(self, handle, info_type, p, length, p_length):
+        ctypes.c_uint.from_address(_address(p)).value = \
+            self.info.get(info_type, 0xF)
+        return SQL_SUCCESS
+
+    def SQLPrepare(self, handle, sql, length):
+        self._statement(handle).sql = getattr(sql, 'value', sql)
+        return SQL_SUCCESS
+
+    def SQLExecute(self, handle):
+        stmt = self._statement(handle)
+        if stmt.open:
+            self.errors.append('24000')
+            return SQL_ERROR
+        self.executed.append((stmt.sql, self._paramsets(stmt)))
+        self._open(stmt, self.tables.get(stmt.sql, ([], [])))
+        return SQL_SUCCESS
+
+    def SQLExecDirectW(self, handle, p_sql, length):
+        stmt = self._statement(handle)
+        if stmt.open:
+            self.errors.append('24000')
+            return SQL_ERROR
+        address = _address(p_sql)
+        end = address
+        while ctypes.c_ushort.from_address(end).value:
+            end += 2
+        sql = ctypes.string_at(address, end - address).decode('utf_16_le')
+        stmt.results = []
+        for part in sql.split(';\n'):
+            part = part.encode('utf-8')
+            self.executed.append((part, []))
+            stmt.results.append(self.tables.get(part, ([], [])))
+        self._open(stmt, stmt.results.pop(0))
+        return SQL_SUCCESS
+
+    def SQLMoreResults(self, handle):
+        stmt = self._statement(handle)
+        if not stmt.results:
+            stmt.open = False
+            return SQL_NO_DATA
+        self._open(stmt, stmt.results.pop(0))
+        return SQL_SUCCESS
+
+    @staticmethod
+    def _open(stmt, result):
+        stmt.cols, stmt.rows = result
+        stmt.open = bool(stmt.cols)
+        stmt.pos = 0
+
+    def SQLBindParameter(self, handle, param_num, io_type, c_type, sql_type,
+                         column_size, digits, p_buff, length, p_ind):
+        self._statement(handle).params[param_num] = (
+            c_type, sql_type, column_size, digits, _address(p_buff), length,
+            _address(p_ind))
+        return SQL_SUCCESS
+
+    def _paramsets(self, stmt):
+        """Rows of the bound parameter values, reports them processed"""
+        if not stmt.params:
+            return []
+        size = stmt.attrs.get(SQL_ATTR_PARAMSET_SIZE, 1)
+        rows = [tuple(self._read(i, *stmt.params[param_num])
+                      for param_num in sorted(stmt.params))
+                for i in range(size)]
+        if stmt.attrs.get(SQL_ATTR_PARAMS_PROCESSED_PTR):
+            ctypes.c_size_t.from_address(
+                stmt.attrs[SQL_ATTR_PARAMS_PROCESSED_PTR]).value = size
+        if stmt.attrs.get(SQL_ATTR_PARAM_STATUS_PTR):
+            status = (ctypes.c_ushort * size).from_address(
+                stmt.attrs[SQL_ATTR_PARAM_STATUS_PTR])
+            for i in range(size):
+                status[i] = SQL_PARAM_ERROR if i in self.failed_paramsets \
+                    else SQL_PARAM_SUCCESS
+        return rows
+
+    @staticmethod
+    def _read(i, c_type, sql_type, column_size, digits, p_buff, stride,
+              p_ind):
+        length = ctypes.c_ssize_t.from_address(
+            p_ind + i * ctypes.sizeof(ctypes.c_ssize_t)).value
+        if length == SQL_NULL_DATA:
+            return None
+        p_value = p_buff + i * stride
+        if c_type == SQL_C_TYPE_DATE:
+            value = SQL_DATE_STRUCT.from_address(p_value)
+            return datetime.date(value.year, value.month, value.day)
+        if c_type == SQL_C_TYPE_TIMESTAMP:
+            value = SQL_TIMESTAMP_STRUCT.from_address(p_value)
+            return datetime.datetime(value.year, value.month, value.day,
+                                     value.hour, value.minute, value.second,
+                                     value.fraction // 1000)
+        if c_type == SQL_C_WCHAR:
+            return ctypes.string_at(p_value, length).decode('utf_16_le')
+        if c_type == SQL_C_CHAR:
+            return ctypes.string_at(p_value, length).decode('utf_8')
+        if c_type == SQL_C_BINARY:
+            return ctypes.string_at(p_value, length)
+        return C_TYPES.get(c_type, ctypes.c_int).from_address(p_value).value
+
+    def SQLNumResultCols(self, handle, p):
+        ctypes.c_short.from_address(_address(p)).value = \
+            len(self._statement(handle).cols)
+        return SQL_SUCCESS
+
+    def SQLDescribeColW(self, handle, col_num, p_name, length, p_name_length,
+                        p_type, p_size, p_digits, p_nullable):
+        name, sql_type, size, scale, nullable = \
+            self._statement(handle).cols[col_num - 1][:5]
+        encoded = name.encode('utf_16_le')
+        ctypes.memmove(_address(p_name), encoded, len(encoded))
+        ctypes.c_short.from_address(_address(p_name_length)).value = len(name)
+        ctypes.c_short.from_address(_address(p_type)).value = sql_type
+        ctypes.c_ssize_t.from_address(_address(p_size)).value = size
+        ctypes.c_short.from_address(_address(p_digits)).value = scale
+        ctypes.c_short.from_address(_address(p_nullable)).value = \
+            SQL_NULLABLE if nullable else SQL_NO_NULLS
+        return SQL_SUCCESS
+
+    def SQLColAttributeW(self, handle, col_num, field, p_char, length,
+                         p_length, p_numeric):
+        col = self._statement(handle).cols[col_num - 1]
+        assert field == SQL_DESC_OCTET_LENGTH
+        ctypes.c_ssize_t.from_address(_address(p_numeric)).value = \
+            col[5] if len(col) > 5 else col[2]
+        return SQL_SUCCESS
+
+    def SQLSetStmtAttr(self, handle, attr, value, length):
+        self._statement(handle).attrs[attr] = _address(value)
+        return SQL_SUCCESS
+
+    def SQLBindCol(self, handle, col_num, c_type, p_buff, length, p_ind):
+        self._statement(handle).binds[col_num] = (
+            c_type, _address(p_buff), length, _address(p_ind))
+        return SQL_SUCCESS
+
+    def SQLFreeStmt(self, handle, option):
+        stmt = self._statement(handle)
+        if option == SQL_CLOSE:
+            stmt.open = False
+            stmt.results = []
+        if option == SQL_UNBIND:
+            stmt.binds = {}
+        if option == SQL_RESET_PARAMS:
+            stmt.params = {}
+        return SQL_SUCCESS
+
+    def SQLFetch(self, handle):
+        stmt = self._statement(handle)
+        if stmt.pos >= len(stmt.rows):
+            return SQL_NO_DATA
+        size = stmt.attrs[SQL_ATTR_ROW_ARRAY_SIZE]
+        row_size = stmt.attrs[SQL_ATTR_ROW_BIND_TYPE]
+        block = stmt.rows[stmt.pos:stmt.pos + size]
+        stmt.block = stmt.row = stmt.pos
+        stmt.offsets = {}
+        stmt.pos += len(block)
+        for i, row in enumerate(block):
+            for col_num, bind in stmt.binds.items():
+                self._write(row[col_num - 1], i, row_size, *bind)
+        ctypes.c_size_t.from_address(
+            stmt.attrs[SQL_ATTR_ROWS_FETCHED_PTR]).value = len(block)
+        return SQL_SUCCESS
+
+    def SQLSetPos(self, handle, row, operation, lock):
+        stmt = self._statement(handle)
+        assert operation == SQL_POSITION
+        stmt.row = stmt.block + row - 1
+        stmt.offsets = {}
+        return SQL_SUCCESS
+
+    def SQLGetData(self, handle, col_num, c_type, p_buff, length, p_ind):
+        stmt = self._statement(handle)
+        value = stmt.rows[stmt.row][col_num - 1]
+        p_buff, p_ind = _address(p_buff), _address(p_ind)
+        if value is None or c_type not in (SQL_C_CHAR, SQL_C_WCHAR,
+                                           SQL_C_BINARY):
+            self._write(value, 0, 0, c_type, p_buff, length, p_ind)
+            return SQL_SUCCESS
+        if c_type == SQL_C_CHAR:
+            data, terminator = value.encode('utf_8'), b'\0'
+        elif c_type == SQL_C_WCHAR:
+            data, terminator = value.encode('utf_16_le'), b'\0\0'
+        else:
+            data, terminator = value, b''
+        offset = stmt.offsets.get(col_num)
+        if offset is not None and offset >= len(data):
+            return SQL_NO_DATA
+        rest = data[offset or 0:]
+        chunk = rest[:length - len(terminator)]
+        ctypes.memmove(p_buff, chunk + terminator, len(chunk + terminator))
+        ctypes.c_ssize_t.from_address(p_ind).value = len(rest)
+        stmt.offsets[col_num] = (offset or 0) + len(chunk)
+        return SQL_SUCCESS_WITH_INFO if len(chunk) < len(rest) \
+            else SQL_SUCCESS
+
+    @staticmethod
+    def _write(value, i, row_size, c_type, p_buff, length, p_ind):
+        ctype = C_TYPES.get(c_type, ctypes.c_int)
+        if c_type in (SQL_C_CHAR, SQL_C_WCHAR, SQL_C_BINARY):
+            stride = length
+        else:
+            stride = ctypes.sizeof(ctype)
+        p_value = p_buff + i * (row_size or stride)
+        indicator = ctypes.c_ssize_t.from_address(
+            p_ind + i * (row_size or ctypes.sizeof(ctypes.c_ssize_t)))
+        if value is None:
+            indicator.value = SQL_NULL_DATA
+        elif c_type == SQL_C_BINARY:
+            ctypes.memmove(p_value, value, min(len(value), length))
+            indicator.value = len(value)
+        elif c_type in (SQL_C_CHAR, SQL_C_WCHAR):
+            # truncated to the buffer, like a driver does
+            if c_type == SQL_C_CHAR:
+                data, terminator = str(value).encode('utf_8'), b'\0'
+            else:
+                data, terminator = str(value).encode('utf_16_le'), b'\0\0'
+            indicator.value = len(data)
+            data = data[:length - len(terminator)] + terminator
+            ctypes.memmove(p_value, data, len(data))
+        elif c_type in (SQL_C_TYPE_DATE, SQL_C_TYPE_TIME,
+                        SQL_C_TYPE_TIMESTAMP):
+            struct = ctype.from_address(p_value)
+            for name, field_type in ctype._fields_:
+                setattr(struct, name, value.microsecond * 1000
+                        if name == 'fraction' else getattr(value, name))
+            indicator.value = stride
+        else:
+            ctype.from_address(p_value).value = value
+            indicator.value = stride
+
+
+def connect(tables, **kwargs):
+    """Connection on a FakeAPI, returns (connection, api)"""
+    api = FakeAPI(tables)
+    return Connection('DSN=fake', env=(ctypes.c_void_p(1), api),
+                      **kwargs), api
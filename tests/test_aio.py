@@ -0,0 +1,29 @@
+import asyncio
+import ctypes
+
+import pytest
+
+from fakeodbc import COLUMNS, FakeAPI, make_rows
+from ohdbc import aio
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+async def extract():
+    api = FakeAPI({b'a': (COLUMNS, make_rows(10))})
+    conn = await aio.connect('DSN=fake', env=(ctypes.c_void_p(1), api))
+    cur = await conn.cursor()
+    cur.arraysize = 4
+    await cur.execute('a')
+    columns = await cur.fetchall(True)
+    with pytest.raises(AttributeError):
+        cur.set_options()
+    await conn.close()
+    return columns
+
+
+def test_async_cursor_fetchall_columns():
+    assert run(extract()) == [list(values) for values in zip(*make_rows(10))]
+
@@ -0,0 +1,29 @@
+from fakeodbc import COLUMNS, connect, make_rows
+
+
+def test_batch_survives_reexecution_through_the_statement_cache():
+    tables = {b'a': (COLUMNS, make_rows(10)),
+              b'b': (COLUMNS, make_rows(10, 'b'))}
+    conn, api = connect(tables)
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.execute('a')
+    batch = cur.fetchbatch()
+    cur.execute('b')
+    other = conn.cursor()
+    other.arraysize = 4
+    other.execute('a')
+    other.fetchmany()
+    other.fetchmany()
+    assert [tuple(row) for row in batch] == make_rows(4)
+
+
+def test_batch_survives_next_fetch():
+    conn, api = connect({b'a': (COLUMNS, make_rows(10))})
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.execute('a')
+    batch = cur.fetchbatch()
+    assert cur.fetchmany(6) == make_rows(10)[4:]
+    assert batch.tuples() == make_rows(4)
+    assert batch[1].name == 'n1' and batch[1]['w'] == 'w1'
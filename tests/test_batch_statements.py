@@ -0,0 +1,69 @@
+import pytest
+
+from fakeodbc import COLUMNS, connect, make_rows
+from ohdbc.exceptions import DatabaseError
+from ohdbc.sql import *
+from ohdbc.sqltypes import SQL_BATCH_SUPPORT
+
+OTHER_COLUMNS = [('k', SQL_WVARCHAR, 20, 0, False),
+                 ('v', SQL_BIGINT, 19, 0, True)]
+OTHER_ROWS = [('k{}'.format(i), i * 10 ** 12) for i in range(7)]
+
+
+def batch_cursor():
+    conn, api = connect({b'select a': (COLUMNS, make_rows(12)),
+                         b'select b': (OTHER_COLUMNS, OTHER_ROWS)})
+    cur = conn.cursor()
+    cur.arraysize = 5
+    return cur, api
+
+
+def test_execute_batch_and_nextset():
+    cur, api = batch_cursor()
+    cur.execute_batch(['select a;', 'update x', 'select b', 'select a'])
+    assert [sql for sql, params in api.executed] == \
+        [b'select a', b'update x', b'select b', b'select a']
+    # one round trip, nothing prepared
+    assert api.handles[cur.handle.value].sql is None
+    assert cur.fetchmany(3) == make_rows(3)
+    # the rest of the result is skipped
+    assert cur.nextset()
+    assert cur.nextset()
+    assert [col.name for col in cur.return_buffer] == ['k', 'v']
+    assert cur.fetchall() == OTHER_ROWS
+    assert cur.nextset()
+    assert cur.fetchall() == make_rows(12)
+    assert cur.nextset() is None
+    assert api.errors == []
+
+
+def test_batches_stay_valid_after_nextset():
+    cur, api = batch_cursor()
+    cur.execute_batch(['select a', 'select b'])
+    batch = cur.fetchbatch()
+    assert cur.nextset()
+    assert cur.fetchall() == OTHER_ROWS
+    assert [tuple(row) for row in batch] == make_rows(5)
+
+
+def test_execute_batch_needs_batch_support():
+    cur, api = batch_cursor()
+    api.info[SQL_BATCH_SUPPORT] = 0
+    with pytest.raises(NotImplementedError):
+        cur.execute_batch(['select a', 'select b'])
+    assert api.executed == []
+
+
+def test_execute_without_sql_after_a_batch_raises():
+    cur, api = batch_cursor()
+    with pytest.raises(DatabaseError):
+        cur.execute()
+    cur.execute_batch(['select a', 'select b'])
+    with pytest.raises(DatabaseError):
+        cur.execute()
+    assert len(api.executed) == 2
+    cur.execute('select b')
+    assert cur.fetchall() == OTHER_ROWS
+    cur.execute()
+    assert cur.fetchall() == OTHER_ROWS
+    assert api.errors == []
@@ -0,0 +1,111 @@
+import datetime
+
+import pytest
+
+from fakeodbc import COLUMNS, connect, make_rows
+from ohdbc.sql import *
+
+pyarrow = pytest.importorskip('pyarrow')
+
+
+def test_arrow_dictionary_grows_across_batches():
+    conn, api = connect({b'a': (COLUMNS, make_rows(3000))})
+    cur = conn.cursor()
+    cur.arraysize = 256
+    cur.dictionary_columns = ['name']
+    cur.execute('a')
+    table = cur.fetch_arrow_table()
+    assert pyarrow.types.is_dictionary(table.schema.field('name').type)
+    assert table.column('name').to_pylist() == \
+        [row[1] for row in make_rows(3000)]
+
+
+def test_arrow_dictionary_past_max_size_raises():
+    conn, api = connect({b'a': (COLUMNS, make_rows(100))})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.dictionary_columns = ['name']
+    cur.dictionary_max_size = 20
+    cur.execute('a')
+    with pytest.raises(ValueError):
+        cur.fetch_arrow_table()
+
+
+def test_load_columns_binds_datetime64_as_structs():
+    numpy = pytest.importorskip('numpy')
+    conn, api = connect({})
+    cur = conn.cursor()
+    stamps = numpy.array(['1969-12-31T23:59:58.123456',
+                          '2024-02-29T13:05:07', 'NaT'], dtype='M8[us]')
+    days = numpy.array(['1900-01-01', 'NaT', '2024-12-31'], dtype='M8[D]')
+    cur.load_columns('insert', {'t': stamps, 'd': days})
+    params = api.handles[cur.handle.value].params
+    assert [params[1][:4], params[2][:4]] == [
+        (SQL_C_TYPE_TIMESTAMP, SQL_TYPE_TIMESTAMP, 26, 6),
+        (SQL_C_TYPE_DATE, SQL_TYPE_DATE, 10, 0)]
+    assert api.executed == [(b'insert', [
+        (datetime.datetime(1969, 12, 31, 23, 59, 58, 123456),
+         datetime.date(1900, 1, 1)),
+        (datetime.datetime(2024, 2, 29, 13, 5, 7), None),
+        (None, datetime.date(2024, 12, 31))])]
+
+
+def test_load_columns_binds_numpy_arrays():
+    numpy = pytest.importorskip('numpy')
+    conn, api = connect({})
+    cur = conn.cursor()
+    ids = numpy.arange(4, dtype=numpy.int32)
+    x = numpy.ma.MaskedArray([0.5, 1.5, 2.5, 3.5],
+                             mask=[False, True, False, False])
+    cur.load_columns('insert', {
+        'id': ids, 'x': x,
+        'name': numpy.array(['a', 'bé', '', 'dddd']),
+        'raw': numpy.array([b'a', b'bb', b'', b'd'])})
+    params = api.handles[cur.handle.value].params
+    assert [params[param_num][:2] for param_num in sorted(params)] == [
+        (SQL_C_SLONG, SQL_INTEGER), (SQL_C_DOUBLE, SQL_DOUBLE),
+        (SQL_C_WCHAR, SQL_WVARCHAR), (SQL_C_CHAR, SQL_VARCHAR)]
+    # contiguous fixed width arrays are bound without a copy
+    assert params[1][4] == ids.ctypes.data
+    assert api.executed == [(b'insert', [
+        (0, 0.5, 'a', 'a'), (1, None, 'bé', 'bb'), (2, 2.5, '', ''),
+        (3, 3.5, 'dddd', 'd')])]
+
+
+def test_load_columns_binds_an_arrow_table():
+    conn, api = connect({})
+    cur = conn.cursor()
+    table = pyarrow.table({'id': pyarrow.array([1, None, 3]),
+                           'name': pyarrow.array(['a', 'b', None])})
+    cur.load_columns('insert', table)
+    assert api.executed == [(b'insert', [
+        (1, 'a'), (None, 'b'), (3, None)])]
+
+
+def test_load_columns_outside_the_bmp_binds_python_values():
+    numpy = pytest.importorskip('numpy')
+    conn, api = connect({})
+    cur = conn.cursor()
+    cur.load_columns('insert', {'s': numpy.array(['a', '\U0001f600'])})
+    assert api.executed == [(b'insert', [('a',), ('\U0001f600',)])]
+
+
+def test_load_columns_of_different_lengths_raise():
+    numpy = pytest.importorskip('numpy')
+    conn, api = connect({})
+    cur = conn.cursor()
+    with pytest.raises(ValueError):
+        cur.load_columns('insert', {'a': numpy.arange(3),
+                                    'b': numpy.arange(4)})
+    assert api.executed == []
+
+
+@pytest.mark.parametrize('dictionary_columns', [['name'], 'auto'])
+def test_dictionary_columns_need_column_binding(dictionary_columns):
+    conn, api = connect({b'a': (COLUMNS, make_rows(10))})
+    cur = conn.cursor()
+    cur.bind_type = 'row'
+    cur.dictionary_columns = dictionary_columns
+    cur.execute('a')
+    with pytest.raises(NotImplementedError):
+        cur.fetchall()
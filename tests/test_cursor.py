@@ -0,0 +1,260 @@
+import ctypes
+import datetime
+import os
+
+import pytest
+
+from fakeodbc import COLUMNS, connect, make_rows
+from ohdbc.exceptions import DatabaseError
+from ohdbc.sql import *
+
+
+def test_reexecute_closes_the_open_result_and_reuses_the_bindings():
+    conn, api = connect({b'a': (COLUMNS, make_rows(10))})
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.execute('a')
+    buffers = cur.return_buffer
+    assert cur.fetchmany(2) == make_rows(2)
+    cur.execute('a')
+    assert cur.fetchall() == make_rows(10)
+    cur.execute('a')
+    assert cur.fetchall() == make_rows(10)
+    assert cur.return_buffer is buffers
+    assert api.errors == []
+
+
+def test_truncated_value_raises():
+    columns = [('s', SQL_VARCHAR, 5, 0, True)]
+    conn, api = connect({b'a': (columns, [('abcdé',), ('é',)])})
+    cur = conn.cursor()
+    cur.arraysize = 2
+    for bind_type in ('column', 'row'):
+        cur.bind_type = bind_type
+        cur.execute('a')
+        with pytest.raises(DatabaseError):
+            cur.fetchall()
+
+
+def test_narrow_text_buffer_from_octet_length():
+    columns = [('s', SQL_VARCHAR, 5, 0, True, 20)]
+    conn, api = connect({b'a': (columns, [('ééééé',), ('€',)])})
+    cur = conn.cursor()
+    cur.execute('a')
+    assert cur.return_buffer[0].charsize == 21
+    assert cur.fetchall() == [('ééééé',), ('€',)]
+
+
+def test_narrow_text_buffer_from_max_char_bytes():
+    columns = [('s', SQL_VARCHAR, 5, 0, True)]
+    conn, api = connect({b'a': (columns, [('ééééé',), ('€',)])},
+                        max_char_bytes=2)
+    cur = conn.cursor()
+    cur.execute('a')
+    assert cur.fetchall() == [('ééééé',), ('€',)]
+
+
+BINARY_COLUMNS = [('id', SQL_INTEGER, 10, 0, False),
+                  ('b', SQL_VARBINARY, 16, 0, True),
+                  ('f', SQL_BINARY, 4, 0, True)]
+BINARY_ROWS = [(1, b'\x00\xff' * 8, b'abcd'), (2, None, None),
+               (3, b'', b'\x01\x02\x03\x04')]
+
+
+@pytest.mark.parametrize('bind_type', ['column', 'row'])
+def test_short_binary_is_bound_and_fetched_as_bytes(bind_type):
+    conn, api = connect({b'a': (BINARY_COLUMNS, BINARY_ROWS)})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.bind_type = bind_type
+    cur.execute('a')
+    assert not cur.return_buffer[1].unbound
+    assert cur.fetchall() == BINARY_ROWS
+    if bind_type == 'column':
+        cur.execute('a')
+        assert [tuple(row) for row in cur.fetchbatch()] == BINARY_ROWS
+
+
+def test_short_binary_to_numpy_and_arrow():
+    pytest.importorskip('numpy')
+    pyarrow = pytest.importorskip('pyarrow')
+    conn, api = connect({b'a': (BINARY_COLUMNS, BINARY_ROWS)})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.execute('a')
+    assert cur.fetchnumpy()[1].tolist() == [row[1] for row in BINARY_ROWS]
+    cur.execute('a')
+    table = cur.fetch_arrow_table()
+    assert table.schema.field('b').type == pyarrow.binary()
+    assert table.to_pylist()[0] == {'id': 1, 'b': b'\x00\xff' * 8,
+                                    'f': b'abcd'}
+    assert table.column('f').to_pylist() == [row[2] for row in BINARY_ROWS]
+
+
+def buffered_cursor():
+    conn, api = connect({b'a': (COLUMNS, make_rows(10))})
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.execute('a')
+    assert cur.fetchmany(1) == make_rows(1)
+    return cur
+
+
+@pytest.mark.parametrize('fetch', [
+    lambda cur: cur.fetchbatch(),
+    lambda cur: cur.fetchnumpy(),
+    lambda cur: cur.fetch_arrow_table(),
+    lambda cur: next(cur.fetch_arrow_batches()),
+    lambda cur: cur.export(os.devnull),
+])
+def test_columnar_fetch_refuses_buffered_rows(fetch):
+    cur = buffered_cursor()
+    with pytest.raises(NotImplementedError):
+        fetch(cur)
+    assert cur.fetchall() == make_rows(10)[1:]
+
+
+def test_columnar_fetch_after_buffered_rows_are_read():
+    pytest.importorskip('pyarrow')
+    cur = buffered_cursor()
+    assert cur.fetchmany(3) == make_rows(4)[1:]
+    assert cur.fetch_arrow_table().column('id').to_pylist() == \
+        list(range(4, 10))
+
+
+@pytest.mark.parametrize('bind_type', ['column', 'row'])
+def test_fetchmany_returns_lists(bind_type):
+    conn, api = connect({b'a': (COLUMNS, make_rows(10))})
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.bind_type = bind_type
+    cur.execute('a')
+    assert cur.fetchmany() == make_rows(4)
+    assert cur.fetchmany(2) == make_rows(6)[4:]
+    assert cur.fetchmany() == make_rows(8)[6:]
+
+
+def test_prefetch_returns_every_block_in_order():
+    conn, api = connect({b'a': (COLUMNS, make_rows(103))})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.prefetch = True
+    cur.execute('a')
+    assert cur.fetchmany(5) == make_rows(5)
+    assert cur.fetchall() == make_rows(103)[5:]
+    cur.execute('a')
+    batches = list(cur.fetch_batches())
+    assert [len(batch) for batch in batches] == [10] * 10 + [3]
+    # every batch keeps its own values while the next ones are fetched
+    assert [tuple(row) for batch in batches for row in batch] == \
+        make_rows(103)
+    assert cur._prefetcher is None
+
+
+def test_prefetch_restarts_on_reexecute():
+    conn, api = connect({b'a': (COLUMNS, make_rows(50)),
+                         b'b': (COLUMNS, make_rows(30, 'b'))})
+    cur = conn.cursor()
+    cur.arraysize = 8
+    cur.prefetch = True
+    cur.execute('a')
+    assert cur.fetchmany(8) == make_rows(8)
+    cur.execute('b')
+    assert cur.fetchall() == make_rows(30, 'b')
+    assert api.errors == []
+
+
+def test_prefetch_needs_column_binding():
+    conn, api = connect({b'a': (COLUMNS, make_rows(5))})
+    cur = conn.cursor()
+    cur.bind_type = 'row'
+    cur.prefetch = True
+    cur.execute('a')
+    with pytest.raises(NotImplementedError):
+        cur.fetchall()
+
+
+def bound_params(api, cur):
+    """(c type, sql type) of every bound parameter"""
+    params = api.handles[cur.handle.value].params
+    return [params[param_num][:2] for param_num in sorted(params)]
+
+
+def test_executemany_binds_one_array_per_placeholder():
+    conn, api = connect({})
+    cur = conn.cursor()
+    rows = [(1, 0.5, 'één', b'\x00\x01', datetime.date(2024, 1, 2)),
+            (2, 2, None, b'', None),
+            (None, None, 'x', None, datetime.date(1999, 12, 31))]
+    cur.executemany('insert', rows)
+    assert bound_params(api, cur) == [
+        (SQL_C_SBIGINT, SQL_BIGINT), (SQL_C_DOUBLE, SQL_DOUBLE),
+        (SQL_C_WCHAR, SQL_WVARCHAR), (SQL_C_BINARY, SQL_VARBINARY),
+        (SQL_C_WCHAR, SQL_WVARCHAR)]
+    # anything but numbers and bytes is sent as text
+    assert api.executed == [(b'insert', [
+        (1, 0.5, 'één', b'\x00\x01', '2024-01-02'),
+        (2, 2.0, None, b'', None),
+        (None, None, 'x', None, '1999-12-31')])]
+    assert cur.params_processed.value == 3
+
+
+def test_execute_params_and_reset():
+    conn, api = connect({})
+    cur = conn.cursor()
+    cur.execute('insert', (1, 'a'))
+    cur.executemany('insert', [])
+    cur.execute('insert')
+    assert api.executed == [(b'insert', [(1, 'a')]), (b'insert', [])]
+
+
+def test_failed_parameter_sets_raise():
+    conn, api = connect({})
+    api.failed_paramsets = {1, 3}
+    cur = conn.cursor()
+    with pytest.raises(DatabaseError, match='2 of 4 parameter sets failed, '
+                                            'first at row 1'):
+        cur.executemany('insert', [(i,) for i in range(4)])
+
+
+def test_row_wise_binding_fetches_structs():
+    conn, api = connect({b'a': (COLUMNS, make_rows(25))})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.bind_type = 'row'
+    cur.execute('a')
+    attrs = api.handles[cur.handle.value].attrs
+    assert attrs[SQL_ATTR_ROW_BIND_TYPE] == \
+        ctypes.sizeof(cur._row_struct) > 0
+    # every bound value lies inside the struct array
+    start = ctypes.addressof(cur._row_array)
+    end = start + ctypes.sizeof(cur._row_array)
+    binds = api.handles[cur.handle.value].binds
+    assert all(start <= bind[1] < end for bind in binds.values())
+    assert cur.fetchmany(13) == make_rows(13)
+    assert list(cur) == make_rows(25)[13:]
+
+
+def test_switching_the_bind_type_between_executions():
+    conn, api = connect({b'a': (COLUMNS, make_rows(7))})
+    cur = conn.cursor()
+    cur.arraysize = 3
+    for bind_type in ('row', 'column', 'row'):
+        cur.bind_type = bind_type
+        cur.execute('a')
+        assert (cur._row_array is not None) == (bind_type == 'row')
+        assert cur.fetchall() == make_rows(7)
+
+
+@pytest.mark.parametrize('fetch', [
+    lambda cur: cur.fetchbatch(),
+    lambda cur: cur.fetchnumpy(),
+    lambda cur: next(cur.fetch_arrow_batches()),
+])
+def test_columnar_fetch_needs_column_binding(fetch):
+    conn, api = connect({b'a': (COLUMNS, make_rows(3))})
+    cur = conn.cursor()
+    cur.bind_type = 'row'
+    cur.execute('a')
+    with pytest.raises(NotImplementedError):
+        fetch(cur)
@@ -0,0 +1,64 @@
+import pytest
+
+from fakeodbc import COLUMNS, LOB_COLUMNS, connect, lob_rows, make_rows
+from ohdbc import instrument
+
+
+@pytest.fixture
+def events():
+    events = []
+
+    def listener(event, source, seconds):
+        assert seconds >= 0
+        events.append(event)
+    instrument.add_listener(listener)
+    yield events
+    instrument.remove_listener(listener)
+
+
+def test_statement_stats(events):
+    conn, api = connect({b'a': (COLUMNS, make_rows(25))}, instrument=True)
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.execute('a')
+    assert cur.fetchall() == make_rows(25)
+    stats = cur.stats
+    assert stats.sql == 'a'
+    assert stats.calls == {'prepare': 1, 'execute': 1, 'bind': 1,
+                           'fetch': 4, 'convert': 3}
+    assert stats.rows == 25
+    assert stats.bytes_fetched == 25 * cur.row_width
+    assert stats.round_trips == 5
+    assert events == ['connect', 'prepare', 'execute', 'bind'] + \
+        ['fetch', 'convert'] * 3 + ['fetch']
+    assert stats.as_dict()['fetch_calls'] == 4
+    # every execution starts new stats, cached statements aren't prepared
+    cur.close()
+    cur = conn.cursor()
+    cur.execute('a')
+    assert cur.stats is not stats
+    assert cur.stats.calls == {'execute': 1, 'bind': 1}
+
+
+def test_getdata_calls_are_counted(events):
+    rows = lob_rows(3)
+    conn, api = connect({b'a': (LOB_COLUMNS, rows)}, instrument=True)
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.lob_chunk_size = 16
+    cur.execute('a')
+    calls = []
+    getdata = api.SQLGetData
+    api.SQLGetData = lambda *args: calls.append(args) or getdata(*args)
+    assert cur.fetchall() == rows
+    assert cur.stats.calls['getdata'] == len(calls) > 3 * 3
+    assert cur.stats.round_trips == 1 + 2 + len(calls)
+
+
+def test_uninstrumented_cursors_have_no_stats(events):
+    conn, api = connect({b'a': (COLUMNS, make_rows(5))})
+    cur = conn.cursor()
+    cur.execute('a')
+    cur.fetchall()
+    assert cur.stats is None
+    assert events == []
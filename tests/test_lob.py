@@ -0,0 +1,63 @@
+import pytest
+
+from fakeodbc import LOB_COLUMNS, connect, lob_rows
+from ohdbc.exceptions import DatabaseError
+from ohdbc.sql import *
+
+
+def lob_cursor(rows):
+    conn, api = connect({b'a': (LOB_COLUMNS, rows)})
+    cur = conn.cursor()
+    cur.arraysize = 4
+    cur.lob_chunk_size = 16
+    return cur, api
+
+
+def test_long_columns_are_read_in_chunks():
+    rows = lob_rows(11)
+    cur, api = lob_cursor(rows)
+    cur.execute('a')
+    assert [col.name for col in cur._unbound] == ['doc', 'blob', 'note']
+    assert cur.rowset_size == 4
+    assert cur.fetchall() == rows
+
+
+def test_long_column_size_binds_shorter_columns():
+    rows = lob_rows(5)
+    cur, api = lob_cursor(rows)
+    cur.long_column_size = 5000
+    cur.execute('a')
+    assert [col.name for col in cur._unbound] == ['doc', 'blob']
+    assert cur.fetchall() == rows
+
+
+def test_without_getdata_extensions():
+    rows = lob_rows(6)
+    cur, api = lob_cursor(rows)
+    api.info[SQL_GETDATA_EXTENSIONS] = 0
+    cur.execute('a')
+    # every column after the first long one is read with SQLGetData,
+    # one row at a time
+    assert [col.name for col in cur._unbound] == \
+        ['doc', 'blob', 'note', 'x']
+    assert cur.rowset_size == 1
+    assert cur.fetchall() == rows
+
+
+def test_streamed_lobs():
+    rows = lob_rows(4)
+    cur, api = lob_cursor(rows)
+    cur.stream_lobs = True
+    cur.execute('a')
+    # streams are read on demand, only until the cursor moves on
+    first, second = cur.fetchmany(2)
+    with pytest.raises(DatabaseError):
+        first[1].read()
+    assert second[1].read() == ''  # NULL
+    row = cur.fetchmany(1)[0]
+    assert row[1].read() == rows[2][1]
+    assert row[2].read() == rows[2][2]
+    assert row[3].read() == ''  # NULL
+    assert row[4] == rows[2][4]
+    with pytest.raises(NotImplementedError):
+        cur.fetchbatch()
@@ -0,0 +1,30 @@
+import pytest
+
+from ohdbc import parallel
+from ohdbc.parallel import partition_predicates
+
+
+def test_modulo_partitions_include_negative_keys():
+    predicates = partition_predicates('id', 3)
+    assert predicates[1] == '{fn MOD({fn MOD(id, 3)} + 3, 3)} = 1'
+    assert predicates[0] == \
+        '({fn MOD({fn MOD(id, 3)} + 3, 3)} = 0) OR id IS NULL'
+
+
+def test_range_partitions():
+    assert partition_predicates('id', 2, bounds=(0, 10)) == [
+        '(id < 5) OR id IS NULL', 'id >= 5']
+
+
+def test_closing_the_extract_skips_pending_partitions(monkeypatch):
+    opened = []
+
+    def open_cursor(connstr, query, arraysize, kwargs):
+        opened.append(query)
+        raise RuntimeError(query)
+
+    monkeypatch.setattr(parallel, '_open_cursor', open_cursor)
+    batches = parallel.parallel_extract('DSN=fake', 'q', 'id', 50, workers=1)
+    with pytest.raises(RuntimeError):
+        next(batches)
+    assert len(opened) < 50
@@ -0,0 +1,100 @@
+import ctypes
+import threading
+
+import pytest
+
+from fakeodbc import FakeAPI
+from ohdbc import pool
+from ohdbc.exceptions import OperationalError
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = FakeAPI({})
+    monkeypatch.setattr(pool, 'shared_env',
+                        lambda: (ctypes.c_void_p(1), api))
+    return api
+
+
+@pytest.fixture
+def clock(api, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(pool.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_idle_connections_expire_for_every_connstr(clock):
+    connections = pool.ConnectionPool(idle_timeout=10, health_check=False)
+    a = connections.acquire('DSN=a')
+    connections.release(a)
+    clock[0] = 20
+    # releasing a connection for another connstr expires the idle one
+    b = connections.acquire('DSN=b')
+    connections.release(b)
+    assert a.closed
+    assert not b.closed
+    assert connections._idle == {'DSN=a': [], 'DSN=b': [(b, 20)]}
+    assert connections._size == {'DSN=a': 0, 'DSN=b': 1}
+    clock[0] = 40
+    assert connections.acquire('DSN=c') is not b
+    assert b.closed
+
+
+def test_min_size_stays_open(clock):
+    connections = pool.ConnectionPool(min_size=1, idle_timeout=10,
+                                      health_check=False)
+    a = connections.acquire('DSN=a')
+    connections.release(a)
+    clock[0] = 20
+    connections.release(connections.acquire('DSN=b'))
+    assert not a.closed
+    assert connections.acquire('DSN=a') is a
+
+
+def test_released_connections_are_reused(api):
+    connections = pool.ConnectionPool(min_size=2)
+    first = connections.acquire('DSN=a')
+    assert connections._size == {'DSN=a': 2}
+    second = connections.acquire('DSN=a')
+    connections.release(first)
+    connections.release(second)
+    # most recently released first
+    assert connections.acquire('DSN=a') is second
+    with connections.connection('DSN=a') as conn:
+        assert conn is first
+    assert connections._idle['DSN=a'][-1][0] is first
+    assert connections._size == {'DSN=a': 2}
+
+
+def test_dead_connections_are_replaced(api):
+    connections = pool.ConnectionPool()
+    conn = connections.acquire('DSN=a')
+    connections.release(conn)
+    api.dead.add(conn.handle.value)
+    replacement = connections.acquire('DSN=a')
+    assert replacement is not conn and conn.closed
+    assert connections._size == {'DSN=a': 1}
+
+
+def test_max_size_waits_for_a_release(api):
+    connections = pool.ConnectionPool(max_size=1)
+    conn = connections.acquire('DSN=a')
+    with pytest.raises(OperationalError):
+        connections.acquire('DSN=a', timeout=0.01)
+    timer = threading.Timer(0.05, connections.release, (conn,))
+    timer.start()
+    assert connections.acquire('DSN=a', timeout=5) is conn
+    timer.join()
+
+
+def test_closed_pool(api):
+    connections = pool.ConnectionPool()
+    idle = connections.acquire('DSN=a')
+    used = connections.acquire('DSN=a')
+    connections.release(idle)
+    connections.close()
+    assert idle.closed and not used.closed
+    connections.release(used)
+    assert used.closed
+    with pytest.raises(OperationalError):
+        connections.acquire('DSN=a')
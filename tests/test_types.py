@@ -0,0 +1,70 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from fakeodbc import connect
+from ohdbc.sql import *
+
+TYPED_COLUMNS = [('d', SQL_TYPE_DATE, 10, 0, True),
+                 ('t', SQL_TYPE_TIME, 8, 0, True),
+                 ('ts', SQL_TYPE_TIMESTAMP, 26, 6, True),
+                 ('price', SQL_DECIMAL, 10, 2, True),
+                 ('big', SQL_NUMERIC, 30, 5, True)]
+TYPED_ROWS = [
+    (datetime.date(2024, 2, 29), datetime.time(13, 5, 7),
+     datetime.datetime(1969, 12, 31, 23, 59, 58, 123456),
+     Decimal('-12.50'), Decimal('1234567890123456789012.34567')),
+    (None, None, None, None, None),
+    (datetime.date(1, 1, 1), datetime.time(0, 0, 0),
+     datetime.datetime(9999, 12, 31, 23, 59, 59, 999999),
+     Decimal('0.05'), Decimal('-0.00001')),
+]
+
+
+def typed_cursor(bind_type='column'):
+    conn, api = connect({b'a': (TYPED_COLUMNS, TYPED_ROWS)})
+    cur = conn.cursor()
+    cur.arraysize = 10
+    cur.bind_type = bind_type
+    cur.execute('a')
+    return cur
+
+
+@pytest.mark.parametrize('bind_type', ['column', 'row'])
+def test_temporal_and_decimal_rows(bind_type):
+    rows = typed_cursor(bind_type).fetchall()
+    assert rows == TYPED_ROWS
+    assert all(type(a) is type(b) for a, b in zip(rows[0], TYPED_ROWS[0]))
+
+
+def test_temporal_and_decimal_batch():
+    batch = typed_cursor().fetchbatch()
+    assert [tuple(row) for row in batch] == TYPED_ROWS
+    assert batch.column('ts') == [row[2] for row in TYPED_ROWS]
+    assert batch.column('price') == [row[3] for row in TYPED_ROWS]
+
+
+def test_temporal_and_decimal_numpy():
+    numpy = pytest.importorskip('numpy')
+    d, t, ts, price, big = typed_cursor().fetchnumpy()
+    assert d.dtype == numpy.dtype('M8[D]')
+    assert d.tolist() == [row[0] for row in TYPED_ROWS]
+    assert t.dtype == numpy.dtype('m8[s]')
+    assert t.tolist() == [datetime.timedelta(hours=13, minutes=5, seconds=7),
+                          None, datetime.timedelta(0)]
+    assert ts.dtype == numpy.dtype('M8[us]')
+    assert ts.tolist() == [row[2] for row in TYPED_ROWS]
+    # up to 18 digits as int64 scaled by 10 ** scale
+    assert price.dtype == numpy.int64
+    assert price.tolist() == [-1250, None, 5]
+    assert big.tolist() == [row[4] for row in TYPED_ROWS]
+
+
+def test_temporal_and_decimal_arrow():
+    pyarrow = pytest.importorskip('pyarrow')
+    table = typed_cursor().fetch_arrow_table()
+    assert table.schema.types == [
+        pyarrow.date32(), pyarrow.time32('s'), pyarrow.timestamp('us'),
+        pyarrow.decimal128(10, 2), pyarrow.decimal128(30, 5)]
+    assert [tuple(row.values()) for row in table.to_pylist()] == TYPED_ROWS